@@ -0,0 +1,82 @@
+"""Benchmark of Mesh.generate_script's vectorized formatting against the
+per-scalar `_fmt_floats`/`_fmt_ints` path it replaced, on 10^4 to 10^7
+vertices. The legacy path is skipped above `LEGACY_MAX_VERTICES` since it
+takes minutes there.
+"""
+
+import time
+import numpy as np
+from svt import Mesh
+
+SIZES = [10**4, 10**5, 10**6, 10**7]
+LEGACY_MAX_VERTICES = 10**6
+
+
+def legacy_mesh_script(mesh):
+    """vertex_vectors/face_indices blocks built one row (and one `sf` call
+    per scalar) at a time, as Mesh.generate_script used to."""
+    vertices = mesh.vertices(0)
+    faces = mesh.faces_indices(0)
+    return "\n".join(
+        [
+            mesh._pov_block(
+                "vertex_vectors",
+                vertices.shape[-1],
+                (
+                    mesh._fmt_floats(vertices[:, i], mesh.precision)
+                    for i in range(vertices.shape[-1])
+                ),
+            ),
+            mesh._pov_block(
+                "face_indices",
+                faces.shape[-1],
+                (mesh._fmt_ints(faces[:, i], 0) for i in range(faces.shape[-1])),
+            ),
+        ]
+    )
+
+
+def vectorized_mesh_script(mesh):
+    """The same blocks through the vectorized formatters."""
+    vertices = mesh.vertices(0)
+    faces = mesh.faces_indices(0)
+    return "\n".join(
+        [
+            mesh._pov_block(
+                "vertex_vectors",
+                vertices.shape[-1],
+                mesh._fmt_float_rows(vertices, mesh.precision),
+            ),
+            mesh._pov_block(
+                "face_indices",
+                faces.shape[-1],
+                mesh._fmt_int_rows(faces, np.zeros(faces.shape[-1], dtype=int)),
+            ),
+        ]
+    )
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    print(f"{'vertices':>10} {'legacy [s]':>12} {'vectorized [s]':>15} {'speedup':>8}")
+    for n_vertices in SIZES:
+        vertices = rng.normal(size=(3, n_vertices))
+        faces = rng.integers(0, n_vertices, size=(3, 2 * n_vertices))
+        mesh = Mesh("benchmark", vertices=vertices, faces_indices=faces)
+
+        script, vectorized_time = timed(vectorized_mesh_script, mesh)
+        if n_vertices <= LEGACY_MAX_VERTICES:
+            legacy_script, legacy_time = timed(legacy_mesh_script, mesh)
+            assert legacy_script == script, "vectorized script differs from legacy"
+            print(
+                f"{n_vertices:>10} {legacy_time:>12.2f} {vectorized_time:>15.2f} "
+                f"{legacy_time / vectorized_time:>7.1f}x"
+            )
+        else:
+            print(f"{n_vertices:>10} {'skipped':>12} {vectorized_time:>15.2f} {'-':>8}")
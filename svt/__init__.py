@@ -5,7 +5,21 @@ from svt.rendering.scene import (
 from svt.rendering.stage import (
     Stage,
 )
-from svt.rendering.scene_objects import Sphere, SphereSweep, Cylinder, Cone, Plane, Mesh
+from svt.rendering.renderer import FrameCache, RenderEngine
+from svt.rendering.report import RenderReport
+from svt.rendering.utils import vectorized
+from svt.rendering.keyframes import Keyframes
+from svt.rendering.data_sources import NpySource, NpzSource
+from svt.rendering.scene_objects import (
+    Sphere,
+    SphereCloud,
+    RodBundle,
+    SphereSweep,
+    Cylinder,
+    Cone,
+    Plane,
+    Mesh,
+)
 
 from svt.plotting.plotting import (
     Figure,
@@ -0,0 +1,174 @@
+"""
+
+This module reads simulation snapshots lazily from disk, so trajectories
+larger than memory can drive a scene (see `Keyframes`).
+
+"""
+
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+
+
+class DataSource:
+    """Read-only array of snapshots stored on disk, stacked along the first
+    axis, of which only the indexed snapshots are read.
+
+    Sources pickle as their file paths: every render or scripting process
+    that receives one reopens the files on first access, and memory-mapped
+    files share the operating system's page cache instead of being copied.
+
+    Attributes
+    ----------
+    shape : tuple
+        Shape of the whole array, `(n_snapshots, ...)`.
+    dtype : numpy.dtype
+        Data type of the array.
+    """
+
+    shape = ()
+    dtype = np.dtype(float)
+    # Attributes holding open files or memory maps, dropped when pickled
+    _handles = ()
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, index):
+        """Snapshot `index`, or the snapshots of an integer array or slice
+        of indices stacked along the first axis."""
+        if isinstance(index, slice):
+            return self._read(np.arange(len(self))[index])
+        index = np.asarray(index)
+        if index.dtype.kind not in "iu":
+            raise TypeError("snapshots can only be indexed by integers")
+        index = np.where(index < 0, index + len(self), index)
+        if np.any((index < 0) | (index >= len(self))):
+            raise IndexError(f"snapshot index out of range ({len(self)} snapshots)")
+        snapshots = self._read(index.reshape(-1))
+        return snapshots.reshape(index.shape + snapshots.shape[1:])
+
+    def __array__(self, dtype=None, copy=None):
+        array = self[:]
+        return array if dtype is None else array.astype(dtype)
+
+    def _read(self, index):
+        """Snapshots of the 1D integer array `index`, stacked."""
+        raise NotImplementedError
+
+    def __getstate__(self):
+        # Open files are not shipped; each process reopens them lazily.
+        state = self.__dict__.copy()
+        state.update({key: None for key in self._handles})
+        return state
+
+
+class NpySource(DataSource):
+    """Snapshots of a `.npy` file, memory-mapped.
+
+    Parameters
+    ----------
+    path : str
+        `.npy` file holding an `(n_snapshots, ...)` array, e.g. written with
+        `np.save` or `np.lib.format.open_memmap`.
+    """
+
+    _handles = ("_array",)
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._array = None
+        self.shape = self._memmap().shape
+        self.dtype = self._memmap().dtype
+
+    def _memmap(self):
+        if self._array is None:
+            self._array = np.load(self.path, mmap_mode="r")
+        return self._array
+
+    def _read(self, index):
+        return np.asarray(self._memmap()[index])
+
+
+class NpzSource(DataSource):
+    """Snapshots split across chunks of `.npz` files, e.g. one file per
+    checkpoint of a simulation.
+
+    Compressed archives can not be memory-mapped, so the chunk holding a
+    snapshot is decompressed on first access and the most recently used
+    chunks are kept.
+
+    Parameters
+    ----------
+    paths : str or list
+        `.npz` files in time order, or a glob pattern matching them (sorted
+        by name).
+    key : str
+        Name of the array in every file, holding that chunk's snapshots
+        along its first axis. [default="arr_0"]
+    cached_chunks : int
+        Number of decompressed chunks kept in memory. [default=2]
+    """
+
+    _handles = ("_chunks",)
+
+    def __init__(self, paths, key="arr_0", cached_chunks=2):
+        if isinstance(paths, (str, Path)):
+            pattern = Path(paths)
+            paths = sorted(pattern.parent.glob(pattern.name))
+        self.paths = [str(path) for path in paths]
+        if not self.paths:
+            raise FileNotFoundError("no .npz file given")
+        if not isinstance(cached_chunks, int) or cached_chunks < 1:
+            raise ValueError("cached_chunks must be a positive integer")
+        self.key = key
+        self.cached_chunks = cached_chunks
+        self._chunks = None
+
+        shapes = []
+        for path in self.paths:
+            shape, self.dtype = self._read_header(path, key)
+            shapes.append(shape)
+        if len({shape[1:] for shape in shapes}) != 1:
+            raise ValueError("the snapshots of every chunk must have the same shape")
+        # first snapshot of each chunk, and one past the last one
+        self._offsets = np.cumsum([0] + [shape[0] for shape in shapes])
+        self.shape = (int(self._offsets[-1]),) + shapes[0][1:]
+
+    @staticmethod
+    def _read_header(path, key):
+        """Shape and dtype of array `key` of a .npz file, without reading it."""
+        with zipfile.ZipFile(path) as archive, archive.open(key + ".npy") as f:
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+        return shape, dtype
+
+    def _chunk(self, chunk_index):
+        if self._chunks is None:
+            self._chunks = OrderedDict()
+        if chunk_index in self._chunks:
+            self._chunks.move_to_end(chunk_index)
+        else:
+            with np.load(self.paths[chunk_index]) as archive:
+                self._chunks[chunk_index] = archive[self.key]
+            while len(self._chunks) > self.cached_chunks:
+                self._chunks.popitem(last=False)
+        return self._chunks[chunk_index]
+
+    def _read(self, index):
+        chunk_indices = np.searchsorted(self._offsets, index, side="right") - 1
+        snapshots = np.empty((len(index),) + self.shape[1:], dtype=self.dtype)
+        for chunk_index in np.unique(chunk_indices):
+            selected = chunk_indices == chunk_index
+            snapshots[selected] = self._chunk(chunk_index)[
+                index[selected] - self._offsets[chunk_index]
+            ]
+        return snapshots
@@ -0,0 +1,543 @@
+"""
+
+This module renders frames on several machines: a `RenderCoordinator`
+serves the frame jobs of a render over a socket, and worker processes
+(`run_worker`), one or more per node, render them with `render_povray`.
+
+Scripts, include files and images are exchanged through a filesystem
+shared by every node (e.g. NFS on a cluster); only the job descriptions
+travel over the socket. For example, with the same `SVT_AUTHKEY` secret
+in the environment of every node:
+
+    # on the node calling render_video
+    from svt.rendering.distributed import RenderCoordinator
+
+    with RenderCoordinator(("0.0.0.0", 6000), os.environ["SVT_AUTHKEY"]) as c:
+        scene.render_video(..., coordinator=c)
+
+    # on every render node
+    python -m svt.rendering.distributed head-node:6000 --processes 4
+
+"""
+
+import argparse
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing import AuthenticationError, Process
+from multiprocessing.connection import Client, Listener
+from tqdm import tqdm
+from svt.rendering.renderer import (
+    render_povray,
+    stitch_tiles,
+    _cache_key,
+    _tile_regions,
+)
+from svt.rendering.scheduler import schedule_render
+
+# Seconds between two checks for expired job leases.
+_LEASE_CHECK_INTERVAL = 1.0
+
+
+class RenderCoordinator:
+    """Work queue of frame renders served to remote workers.
+
+    Workers connect with `run_worker`, then repeatedly receive a job (the
+    path of a .pov script and the `render_povray` settings), render it and
+    report the result. A job whose render fails, whose worker disconnects,
+    or which is not reported within `job_timeout` is queued again, up to
+    `max_attempts` times in total.
+
+    Workers stay connected between renders, so a coordinator can serve
+    every render of a session; close it (or use it as a context manager)
+    to stop its workers.
+
+    Parameters
+    ----------
+    address : tuple or str
+        `(host, port)` to listen on over TCP, or a Unix socket path.
+        [default=("localhost", 0)] Port 0 picks a free port; see `address`
+        for the one actually used. Listen on ("0.0.0.0", port) to accept
+        workers of other machines.
+    authkey : bytes or str or None
+        Shared secret workers authenticate with. [default=None]
+        If None, a random key is generated (see `authkey`).
+    max_attempts : int
+        Number of times a job is tried before the render fails.
+        [default=3]
+    job_timeout : float or None
+        Seconds after which a job not reported by its worker is considered
+        lost and queued again. [default=None] If None, jobs are only
+        queued again when their worker fails or disconnects.
+
+    Attributes
+    ----------
+    address : tuple or str
+        Address the workers connect to.
+    authkey : bytes
+        Shared secret of the workers.
+    """
+
+    def __init__(
+        self, address=("localhost", 0), authkey=None, max_attempts=3, job_timeout=None
+    ):
+        if not isinstance(max_attempts, int) or max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer")
+        if job_timeout is not None and job_timeout <= 0:
+            raise ValueError("job_timeout must be a positive number or None")
+        if authkey is None:
+            authkey = secrets.token_hex(32)
+        if isinstance(authkey, str):
+            authkey = authkey.encode()
+        self.authkey = authkey
+        self.max_attempts = max_attempts
+        self.job_timeout = job_timeout
+
+        self._listener = Listener(address, authkey=self.authkey)
+        self.address = self._listener.address
+        self._condition = threading.Condition()
+        self._closed = False
+        # job id -> (file path, settings)
+        self._jobs = {}
+        self._pending = deque()
+        # job id -> (worker id, lease deadline)
+        self._assigned = {}
+        self._attempts = {}
+        # (job id, error text or None) of every finished or failed job
+        self._results = queue.Queue()
+        self._next_job_id = 0
+        self._next_worker_id = 0
+        self._connected_workers = 0
+        self._local_workers = []
+        self._acceptor = threading.Thread(target=self._accept, daemon=True)
+        self._acceptor.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start_local_workers(self, n_workers, pov_thread=None):
+        """Start `n_workers` worker processes on this machine, e.g. to test
+        a distributed render on one host. They are stopped by `close`."""
+        # Started as new interpreters through the command line entry (see
+        # `main`), so they inherit none of the coordinator's sockets.
+        command = [sys.executable, "-m", __name__, _format_address(self.address)]
+        command += ["--processes", str(n_workers)]
+        if pov_thread is not None:
+            command += ["--pov-thread", str(pov_thread)]
+        environment = {**os.environ, "SVT_AUTHKEY": self.authkey.decode()}
+        self._local_workers.append(subprocess.Popen(command, env=environment))
+
+    def render(self, frames, settings, on_rendered=None):
+        """Render every frame of `frames` on the workers.
+
+        `frames` is consumed lazily and each frame is queued as soon as it
+        is produced, so workers render while later frames are scripted.
+        Frames split into `tiles` (see `render_povray`) are queued as one
+        job per tile, spreading a single frame over several workers, and
+        stitched here once every tile is rendered.
+
+        Parameters
+        ----------
+        frames : iterable
+            File paths (without extension) of written .pov scripts. They
+            must resolve to the same files on every worker.
+        settings : dict
+            Keyword arguments of `render_povray` (except `filename`). A
+            worker's own `pov_thread` takes precedence over the one given.
+        on_rendered : callable or None
+            `on_rendered(file_path)`, called as each frame is rendered.
+            [default=None]
+
+        Raises
+        ------
+        IOError
+            If a frame fails `max_attempts` times.
+        RuntimeError
+            If every worker started by `start_local_workers` exited while no
+            other worker is connected, so no frame could be rendered.
+        """
+        tiles = settings.get("tiles", 1)
+        pbar = tqdm(desc="Rendering")  # Progress Bar
+        # job id -> file path, and tiles left to render of every tiled frame
+        file_paths = {}
+        tiles_left = {}
+        try:
+            for file_path in frames:
+                if tiles == 1:
+                    job_id = self._submit(os.path.abspath(file_path), settings)
+                    file_paths[job_id] = file_path
+                else:
+                    self._submit_tiles(file_path, settings, file_paths, tiles_left)
+                while not self._results.empty():
+                    self._collect(file_paths, tiles_left, settings, on_rendered, pbar)
+            while file_paths:
+                self._collect(file_paths, tiles_left, settings, on_rendered, pbar)
+        finally:
+            pbar.close()
+            if file_paths:
+                self._cancel(file_paths)
+
+    def close(self):
+        """Stop serving jobs and disconnect the workers."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        # wake the acceptor blocked on the listener
+        try:
+            Client(self.address, authkey=self.authkey).close()
+        except (OSError, EOFError, AuthenticationError):
+            pass
+        self._acceptor.join()
+        for worker in self._local_workers:
+            worker.wait()
+        self._local_workers = []
+
+    def _submit(self, file_path, settings):
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("the coordinator is closed")
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self._jobs[job_id] = (file_path, dict(settings))
+            self._attempts[job_id] = 0
+            self._pending.append(job_id)
+            self._condition.notify()
+        return job_id
+
+    def _submit_tiles(self, file_path, settings, file_paths, tiles_left):
+        """Queue a job per tile of frame `file_path`, unless it is cached."""
+        cache = settings.get("cache")
+        if cache is not None:
+            key = _cache_key(cache, file_path, **_cache_settings(settings))
+            if cache.fetch(key, file_path + ".png"):
+                # reported like a rendered frame
+                job_id = self._submit_done(file_path)
+                file_paths[job_id] = file_path
+                return
+        tile_settings = {**settings, "tiles": 1, "cache": None}
+        regions = _tile_regions(
+            settings["width"], settings["height"], settings["tiles"]
+        )
+        tiles_left[file_path] = len(regions)
+        for region in regions:
+            job_id = self._submit(
+                os.path.abspath(file_path), {**tile_settings, "region": region}
+            )
+            file_paths[job_id] = file_path
+
+    def _submit_done(self, file_path):
+        """Id of a job reported as done without being rendered."""
+        with self._condition:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+        self._results.put((job_id, None))
+        return job_id
+
+    def _collect(self, file_paths, tiles_left, settings, on_rendered, pbar):
+        """Wait for the next finished job of `file_paths` and report it."""
+        while True:
+            try:
+                job_id, error = self._results.get(timeout=_LEASE_CHECK_INTERVAL)
+                break
+            except queue.Empty:
+                self._check_workers()
+        if job_id not in file_paths:  # job of a cancelled render
+            return
+        if error is not None:
+            raise IOError(
+                f"Rendering {file_paths[job_id]} failed {self.max_attempts} "
+                f"times, last with the following error: {error}"
+            )
+        file_path = file_paths.pop(job_id)
+        if file_path in tiles_left:
+            tiles_left[file_path] -= 1
+            if tiles_left[file_path]:
+                return
+            del tiles_left[file_path]
+            stitch_tiles(
+                file_path, settings["width"], settings["height"], settings["tiles"]
+            )
+            cache = settings.get("cache")
+            if cache is not None:
+                key = _cache_key(cache, file_path, **_cache_settings(settings))
+                cache.store(key, file_path + ".png")
+        if on_rendered is not None:
+            on_rendered(file_path)
+        pbar.update()
+
+    def _check_workers(self):
+        """Raise if every local worker process exited and no worker is
+        connected, as the render would then wait forever."""
+        exit_codes = [worker.poll() for worker in self._local_workers]
+        if not exit_codes or None in exit_codes:
+            return
+        with self._condition:
+            if self._connected_workers:
+                return
+        raise RuntimeError(
+            "every local worker exited (exit codes "
+            + ", ".join(map(str, exit_codes))
+            + ") and no other worker is connected"
+        )
+
+    def _cancel(self, job_ids):
+        """Drop the queued jobs of `job_ids`, e.g. after a failed render."""
+        with self._condition:
+            self._pending = deque(
+                job_id for job_id in self._pending if job_id not in job_ids
+            )
+            for job_id in job_ids:
+                self._forget(job_id)
+
+    def _forget(self, job_id):
+        self._jobs.pop(job_id, None)
+        self._assigned.pop(job_id, None)
+        self._attempts.pop(job_id, None)
+
+    def _accept(self):
+        """Serve every worker that connects, each on its own thread."""
+        with self._listener:
+            while not self._closed:
+                try:
+                    connection = self._listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    continue  # e.g. a client with the wrong authkey
+                if self._closed:
+                    connection.close()
+                    return
+                worker_id = self._next_worker_id
+                self._next_worker_id += 1
+                threading.Thread(
+                    target=self._serve, args=(connection, worker_id), daemon=True
+                ).start()
+
+    def _serve(self, connection, worker_id):
+        """Exchange jobs and results with one worker until it disconnects
+        or the coordinator closes."""
+        with self._condition:
+            self._connected_workers += 1
+        try:
+            while True:
+                message = connection.recv()
+                if message[0] == "done":
+                    self._report(message[1], worker_id)
+                elif message[0] == "failed":
+                    self._report(message[1], worker_id, message[2])
+                job = self._next_job(worker_id)
+                if job is None:
+                    connection.send(("stop",))
+                    return
+                connection.send(("job", *job))
+        except (EOFError, OSError):
+            pass  # worker lost, its job is queued again below
+        finally:
+            connection.close()
+            with self._condition:
+                self._connected_workers -= 1
+                lost = [
+                    job_id
+                    for job_id, (owner, _) in self._assigned.items()
+                    if owner == worker_id
+                ]
+                for job_id in lost:
+                    self._retry(job_id, "worker disconnected")
+
+    def _next_job(self, worker_id):
+        """`(job_id, file_path, settings)` of the next queued job, leased to
+        `worker_id`, or None once the coordinator is closed."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                self._expire_leases()
+                if self._pending:
+                    job_id = self._pending.popleft()
+                    deadline = (
+                        None
+                        if self.job_timeout is None
+                        else time.monotonic() + self.job_timeout
+                    )
+                    self._assigned[job_id] = (worker_id, deadline)
+                    self._attempts[job_id] += 1
+                    return (job_id, *self._jobs[job_id])
+                self._condition.wait(_LEASE_CHECK_INTERVAL)
+
+    def _expire_leases(self):
+        now = time.monotonic()
+        expired = [
+            job_id
+            for job_id, (_, deadline) in self._assigned.items()
+            if deadline is not None and deadline < now
+        ]
+        for job_id in expired:
+            self._retry(job_id, f"no result within {self.job_timeout} s")
+
+    def _report(self, job_id, worker_id, error=None):
+        """Record the result of `job_id` from `worker_id`. Results of jobs no
+        longer leased to the worker (expired or cancelled) are ignored."""
+        with self._condition:
+            if self._assigned.get(job_id, (None,))[0] != worker_id:
+                return
+            if error is None:
+                del self._assigned[job_id]
+                self._forget(job_id)
+                self._results.put((job_id, None))
+            else:
+                self._retry(job_id, error)
+
+    def _retry(self, job_id, error):
+        """Queue the leased `job_id` again, or fail it after `max_attempts`."""
+        del self._assigned[job_id]
+        if self._attempts[job_id] < self.max_attempts:
+            self._pending.appendleft(job_id)
+            self._condition.notify()
+        else:
+            self._forget(job_id)
+            self._results.put((job_id, error))
+
+
+def _cache_settings(settings):
+    """The `render_povray` settings that are part of a frame's cache key."""
+    names = (
+        "width",
+        "height",
+        "antialias",
+        "quality",
+        "transparency",
+        "antialias_threshold",
+        "antialias_depth",
+    )
+    return {name: settings[name] for name in names if name in settings}
+
+
+def _connect(address, authkey, connect_retries, retry_interval):
+    """Connect to a coordinator, retrying while it is not listening yet."""
+    for attempt in range(connect_retries + 1):
+        try:
+            return Client(address, authkey=authkey)
+        except (ConnectionRefusedError, FileNotFoundError):
+            if attempt == connect_retries:
+                raise
+            time.sleep(retry_interval)
+
+
+def run_worker(
+    address,
+    authkey,
+    pov_thread=None,
+    connect_retries=30,
+    retry_interval=1.0,
+    processes=1,
+):
+    """Render the jobs of a `RenderCoordinator` until it closes.
+
+    Parameters
+    ----------
+    address : tuple or str
+        `RenderCoordinator.address`.
+    authkey : bytes
+        `RenderCoordinator.authkey`.
+    pov_thread : int or None
+        Work threads of each render. [default=None]
+        If None, the coordinator's setting is used, or, if the coordinator
+        leaves the threads to its workers, this node's CPUs are split
+        between its `processes` workers (see `schedule_render`).
+    connect_retries : int
+        Number of retries while the coordinator is not reachable.
+        [default=30]
+    retry_interval : float
+        Seconds between two connection attempts. [default=1.0]
+    processes : int
+        Number of workers rendering concurrently on this node. [default=1]
+
+    Returns
+    -------
+    int
+        Number of frames rendered.
+    """
+    if pov_thread is None:
+        _, node_threads = schedule_render(processes, processes)
+    rendered = 0
+    connection = _connect(address, authkey, connect_retries, retry_interval)
+    with connection:
+        connection.send(("ready",))
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:  # coordinator gone
+                return rendered
+            if message[0] == "stop":
+                return rendered
+            _, job_id, file_path, settings = message
+            if pov_thread is not None:
+                settings = {**settings, "pov_thread": pov_thread}
+            elif "pov_thread" not in settings:
+                settings = {**settings, "pov_thread": node_threads}
+            try:
+                render_povray(file_path, **settings)
+            except Exception as error:
+                connection.send(("failed", job_id, f"{type(error).__name__}: {error}"))
+                continue
+            rendered += 1
+            connection.send(("done", job_id))
+
+
+def _parse_address(address):
+    """`(host, port)` of a "host:port" string, or a Unix socket path."""
+    host, separator, port = address.rpartition(":")
+    if separator and port.isdigit():
+        return host, int(port)
+    return address
+
+
+def _format_address(address):
+    """ "host:port" string of a TCP address, or a Unix socket path."""
+    if isinstance(address, tuple):
+        return "%s:%d" % address
+    return address
+
+
+def main(argv=None):
+    """Command line entry of a worker node:
+
+    SVT_AUTHKEY=<key> python -m svt.rendering.distributed host:port -n 4
+    """
+    parser = argparse.ArgumentParser(description="Render the frames of a coordinator.")
+    parser.add_argument("address", help="coordinator host:port or Unix socket path")
+    parser.add_argument(
+        "-n", "--processes", type=int, default=1, help="worker processes"
+    )
+    parser.add_argument(
+        "--pov-thread", type=int, default=None, help="work threads per render"
+    )
+    args = parser.parse_args(argv)
+    authkey = os.environ.get("SVT_AUTHKEY")
+    if authkey is None:
+        parser.error("the SVT_AUTHKEY environment variable must be set")
+    worker_args = (_parse_address(args.address), authkey.encode())
+    workers = [
+        Process(
+            target=run_worker,
+            args=worker_args,
+            kwargs={"pov_thread": args.pov_thread, "processes": args.processes},
+        )
+        for _ in range(args.processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+
+This module streams rendered frames into ffmpeg to encode videos.
+
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+
+# Profile name -> (file extension, ffmpeg output options)
+VIDEO_PROFILES = {
+    # Production/compositing output: 10-bit 4:4:4 with an alpha channel.
+    "prores4444": (
+        ".mov",
+        ["-c:v", "prores_ks", "-profile:v", "4444", "-pix_fmt", "yuva444p10le"],
+    ),
+    # Fast, small previews (no alpha). yuv420p needs even dimensions.
+    "h264": (
+        ".mp4",
+        [
+            "-c:v",
+            "libx264",
+            "-preset",
+            "veryfast",
+            "-crf",
+            "23",
+            "-pix_fmt",
+            "yuv420p",
+            "-vf",
+            "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+        ],
+    ),
+    # Web previews that keep the alpha channel.
+    "vp9": (
+        ".webm",
+        [
+            "-c:v",
+            "libvpx-vp9",
+            "-deadline",
+            "realtime",
+            "-b:v",
+            "0",
+            "-crf",
+            "32",
+            "-pix_fmt",
+            "yuva420p",
+        ],
+    ),
+}
+
+
+def _find_ffmpeg_executable():
+    """Locate the ffmpeg executable.
+
+    Resolution order:
+    1. FFMPEG_BINARY environment variable (explicit override).
+    2. `ffmpeg` resolved via PATH with shutil.which.
+
+    Raises
+    ------
+    FileNotFoundError
+        If ffmpeg can not be found on PATH.
+    """
+    executable = os.environ.get("FFMPEG_BINARY", "ffmpeg")
+    found = shutil.which(executable)
+    if found:
+        return found
+    raise FileNotFoundError(
+        f"Could not find ffmpeg ('{executable}') on PATH. Install FFmpeg and "
+        "ensure it is on PATH, or set the FFMPEG_BINARY environment variable "
+        "to its full path."
+    )
+
+
+class VideoEncoder:
+    """ffmpeg process encoding frames as they are rendered.
+
+    Frames can be added in any order; they are piped to ffmpeg in frame
+    order as soon as every earlier frame has been added, so the video is
+    finished shortly after its last frame is rendered. Each encoder is its
+    own ffmpeg process, so the videos of several cameras encode
+    concurrently.
+
+    Parameters
+    ----------
+    filename : str
+        Output video path without extension; the profile's extension is
+        appended.
+    frames_per_second : int
+        Frame rate of the video.
+    profile : str
+        One of `VIDEO_PROFILES`. [default="prores4444"]
+
+    Raises
+    ------
+    FileNotFoundError
+        If no ffmpeg executable can be located on the system.
+    """
+
+    def __init__(self, filename, frames_per_second, profile="prores4444"):
+        if profile not in VIDEO_PROFILES:
+            raise ValueError(
+                "video profile must be one of the following: "
+                + ", ".join(VIDEO_PROFILES)
+            )
+        extension, output_options = VIDEO_PROFILES[profile]
+        self.filename = str(filename) + extension
+        self._pending = {}  # frame number -> image file
+        self._next_frame = 0
+        self._broken = False
+        # add_frame is called both from render-pool callbacks and the caller
+        self._lock = threading.Lock()
+
+        cmds = [
+            _find_ffmpeg_executable(),
+            "-y",
+            "-loglevel",
+            "error",
+            "-f",
+            "image2pipe",
+            "-framerate",
+            str(frames_per_second),
+            "-c:v",
+            "png",
+            "-i",
+            "-",
+            *output_options,
+            self.filename,
+        ]
+        # ffmpeg's errors go to a file rather than a pipe, which would block
+        # ffmpeg (and the frames written to it) once full
+        self._stderr = tempfile.TemporaryFile()
+        try:
+            self._process = subprocess.Popen(
+                cmds,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=self._stderr,
+            )
+        except OSError as e:
+            self._stderr.close()
+            raise IOError(f"Failed to launch ffmpeg ({cmds[0]}): {e}") from e
+
+    def add_frame(self, frame_number, image_file):
+        """Queue the rendered `image_file` as frame `frame_number` (from 0),
+        and pipe every frame that is now next in order."""
+        with self._lock:
+            self._pending[frame_number] = image_file
+            while self._next_frame in self._pending:
+                image_file = self._pending.pop(self._next_frame)
+                self._next_frame += 1
+                if self._broken:
+                    continue
+                try:
+                    self._process.stdin.write(Path(image_file).read_bytes())
+                except BrokenPipeError:
+                    # ffmpeg exited early; its error is reported by close()
+                    self._broken = True
+
+    def close(self):
+        """Finish the video and wait for ffmpeg.
+
+        Raises
+        ------
+        IOError
+            If frames are missing or ffmpeg fails.
+        """
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._process.wait()
+        self._stderr.seek(0)
+        stderr_text = self._stderr.read().decode(errors="replace")
+        self._stderr.close()
+        if self._pending:
+            raise IOError(
+                f"Video {self.filename} is missing frame {self._next_frame} "
+                f"({len(self._pending)} later frames were not encoded)."
+            )
+        if self._process.returncode:
+            raise IOError(
+                f"ffmpeg failed to encode {self.filename} with the following "
+                "error: " + stderr_text
+            )
+
+    def abort(self):
+        """Stop ffmpeg without finishing the video."""
+        self._process.kill()
+        self._process.wait()
+        self._stderr.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
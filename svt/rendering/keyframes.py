@@ -0,0 +1,160 @@
+"""
+
+This module interpolates values sampled at discrete times, e.g. simulation
+output, as a function of time usable by every TimeCallable.
+
+"""
+
+import numpy as np
+from svt.rendering.data_sources import DataSource
+
+INTERPOLATIONS = ("step", "linear", "cubic")
+
+
+class Keyframes:
+    """Values sampled at `times`, interpolated at any time in between.
+
+    Instances are callables of time, so they can be passed wherever a
+    time-varying attribute is accepted (TimeVecN, TimeVecMN, TimeScalar,
+    ...), e.g. ``Sphere("ball", position=Keyframes(t, x), radius=0.1)``.
+    They are `vectorized`: called with an array of times, the values are
+    returned with a trailing time axis, so a whole frame schedule is
+    interpolated in one NumPy pass (see `TimeCallable.evaluate_many`).
+
+    Times before the first or after the last keyframe hold the first or
+    last value. Times within a rounding error of a keyframe (e.g. a frame
+    time `n / fps` next to a keyframe of `np.linspace`) are snapped to it,
+    so "step" keyframes are not read one keyframe early. The keyframe
+    bracketing the previous call is remembered, so evaluating frames in
+    order costs no search; otherwise the bracket is found by bisection.
+    Only the keyframes around the requested time are read from `values`,
+    so trajectories larger than memory can be given as a `DataSource`
+    (e.g. a memory-mapped `NpySource`).
+
+    Parameters
+    ----------
+    times : array_like
+        Strictly increasing 1D sequence of keyframe times.
+    values : array_like or DataSource
+        Values at `times`, stacked along the first axis: `values[i]` is the
+        value at `times[i]` (a scalar, a vector or an M×N array).
+    interpolation : str
+        One of `INTERPOLATIONS`. [default="linear"]
+        "step" holds each keyframe until the next one, "linear"
+        interpolates linearly and "cubic" uses a cubic Hermite spline whose
+        slopes are second-order finite differences of the keyframes (as
+        `np.gradient`).
+
+    Raises
+    ------
+    ValueError
+        If `times` is not strictly increasing, does not match `values` or
+        `interpolation` is unknown.
+    """
+
+    vectorized = True
+
+    def __init__(self, times, values, interpolation="linear"):
+        times = np.asarray(times, dtype=float)
+        if not isinstance(values, (np.ndarray, DataSource)):
+            values = np.asarray(values)
+        if times.ndim != 1 or len(times) == 0:
+            raise ValueError("times must be a non-empty 1D sequence")
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("times must be strictly increasing")
+        if values.shape[:1] != times.shape:
+            raise ValueError(
+                f"values must have one entry per time ({len(times)}), but "
+                f"have shape {values.shape}"
+            )
+        if values.dtype.kind not in "fiu":
+            raise ValueError("values must be real numbers")
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(
+                "interpolation must be one of the following: "
+                + ", ".join(INTERPOLATIONS)
+            )
+        self.times = times
+        self.values = values
+        self.interpolation = interpolation
+        self._bracket = 0
+        # far below any keyframe spacing, far above float rounding errors
+        self._tolerance = 1e-9 * max(1.0, float(np.max(np.abs(times))))
+        if len(times) > 1:
+            self._tolerance = min(self._tolerance, float(np.min(np.diff(times))) / 4)
+
+    def __call__(self, time):
+        """Interpolated value at `time`, or at every time of a 1D array of
+        times (stacked along a trailing axis)."""
+        if np.ndim(time) == 0:
+            index = np.array([self._locate(float(time))])
+            value = self._interpolate(np.array([time], dtype=float), index)[0]
+            # Vectors and scalars are returned as Python lists and numbers
+            return value.tolist() if value.ndim < 2 else value
+        time = np.asarray(time, dtype=float)
+        index = np.searchsorted(self.times, time + self._tolerance, side="right") - 1
+        return np.moveaxis(self._interpolate(time, np.maximum(index, 0)), 0, -1)
+
+    def _locate(self, time):
+        """Index of the last keyframe at or before `time` (0 before the first
+        keyframe), starting from the bracket of the previous call."""
+        time = time + self._tolerance
+        times = self.times
+        index = self._bracket
+        if times[index] <= time and (
+            index + 1 == len(times) or time < times[index + 1]
+        ):
+            return index
+        if index + 2 < len(times) and times[index + 1] <= time < times[index + 2]:
+            index += 1
+        else:
+            index = max(int(np.searchsorted(times, time, side="right")) - 1, 0)
+        self._bracket = index
+        return index
+
+    def _interpolate(self, time, index):
+        """Values at the 1D array `time`, whose keyframe brackets start at
+        `index`, stacked along the first axis."""
+        n_keyframes = len(self.times)
+        if self.interpolation == "step" or n_keyframes == 1:
+            return self.values[index]
+
+        index = np.minimum(index, n_keyframes - 2)
+        t0 = self.times[index]
+        step = self.times[index + 1] - t0
+        s = np.clip((time - t0) / step, 0, 1)
+        s = s.reshape(s.shape + (1,) * (self.values.ndim - 1))
+        v0 = self.values[index]
+        v1 = self.values[index + 1]
+        if self.interpolation == "linear":
+            return v0 + s * (v1 - v0)
+
+        step = step.reshape(s.shape)
+        m0 = self._slopes(index)
+        m1 = self._slopes(index + 1)
+        s2 = s * s
+        s3 = s2 * s
+        return (
+            (2 * s3 - 3 * s2 + 1) * v0
+            + (s3 - 2 * s2 + s) * step * m0
+            + (3 * s2 - 2 * s3) * v1
+            + (s3 - s2) * step * m1
+        )
+
+    def _slopes(self, index):
+        """Time derivatives at the keyframes `index`: second-order central
+        differences inside, one-sided differences at both ends."""
+        last = len(self.times) - 1
+        before = np.maximum(index - 1, 0)
+        after = np.minimum(index + 1, last)
+        shape = index.shape + (1,) * (self.values.ndim - 1)
+        h_before = (self.times[index] - self.times[before]).reshape(shape)
+        h_after = (self.times[after] - self.times[index]).reshape(shape)
+        value = self.values[index]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d_before = (value - self.values[before]) / h_before
+            d_after = (self.values[after] - value) / h_after
+            central = (h_after * d_before + h_before * d_after) / (h_before + h_after)
+        return np.where(
+            h_before == 0, d_after, np.where(h_after == 0, d_before, central)
+        )
@@ -4,11 +4,57 @@ This module includes utility methods to support POVRay and ThreeJs rendering.
 
 """
 
+import hashlib
+import math
 import os
 import platform
+import re
 import shutil
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from multiprocessing import Pool
 from pathlib import Path
+from PIL import Image
+from svt.rendering.scheduler import available_cpus, schedule_render
+
+_INCLUDE_PATTERN = re.compile(rb'#include\s+"([^"]+)"')
+
+# Profile name -> settings of `Scene.render_frames`/`render_video`: the
+# scale of the image size, `render_povray`'s quality and antialiasing
+# (threshold and depth None keep POV-Ray's defaults, 0.3 and 3), and the
+# stride of the rendered frames. Every profile keeps the cameras' framing.
+RENDER_PROFILES = {
+    # Layout and motion checks: no shadows, reflections or antialiasing.
+    "draft": {
+        "resolution_scale": 0.25,
+        "quality": 3,
+        "antialias": "off",
+        "antialias_threshold": None,
+        "antialias_depth": None,
+        "frame_stride": 4,
+    },
+    # Look development: shadows and reflections, coarse antialiasing.
+    "preview": {
+        "resolution_scale": 0.5,
+        "quality": 8,
+        "antialias": "on",
+        "antialias_threshold": 0.3,
+        "antialias_depth": 2,
+        "frame_stride": 2,
+    },
+    # Production output.
+    "final": {
+        "resolution_scale": 1,
+        "quality": 11,
+        "antialias": "on",
+        "antialias_threshold": None,
+        "antialias_depth": None,
+        "frame_stride": 1,
+    },
+}
 
 
 def _find_povray_executable():
@@ -59,6 +105,279 @@ def _find_povray_executable():
     )
 
 
+def _script_digest(script_file, include_digests=None, _seen=None):
+    """SHA-256 of a POV-Ray script and, recursively, of every file it
+    `#include`s by a path that exists (e.g. the shared static include).
+    Standard library includes ("colors.inc", ...) resolve to no local file
+    and are only hashed by name, as part of the script text.
+
+    Parameters
+    ----------
+    script_file : str or Path
+        The POV-Ray script.
+    include_digests : dict or None
+        Digests of included files keyed by (path, mtime, size), filled in
+        as they are hashed, so that the frames of one render hash a shared
+        include only once. Only share it while the includes are not
+        rewritten: a rewrite of the same size within the filesystem's mtime
+        resolution keeps its key. None hashes every include.
+        [default=None]
+
+    Returns
+    -------
+    hashlib object
+        Digest of the script and its local includes.
+    """
+    if _seen is None:
+        _seen = set()
+    digest = hashlib.sha256()
+    script = Path(script_file).read_bytes()
+    digest.update(script)
+    for include in _INCLUDE_PATTERN.findall(script):
+        include_file = Path(include.decode(errors="replace"))
+        if include_file in _seen or not include_file.is_file():
+            continue
+        _seen.add(include_file)
+        if include_digests is None:
+            digest.update(_script_digest(include_file, None, _seen).digest())
+            continue
+        stat = include_file.stat()
+        memo_key = (include_file, stat.st_mtime_ns, stat.st_size)
+        if memo_key not in include_digests:
+            include_digests[memo_key] = _script_digest(
+                include_file, include_digests, _seen
+            ).digest()
+        digest.update(include_digests[memo_key])
+    return digest
+
+
+class FrameCache:
+    """Content-addressed store of rendered frames.
+
+    A frame is keyed by the SHA-256 of its .pov script (including the
+    local files it `#include`s) and the render settings that affect the
+    image (width, height, quality, antialias, transparency). When
+    `render_povray` is given a cache, a frame whose key is already stored
+    is copied from the cache instead of rendered.
+
+    Files referenced by the script but not `#include`d (e.g. image or bump
+    map textures) are not part of the key; clear the cache after editing
+    them in place.
+
+    The cache is a plain directory of `<key>.png` files, so it is shared
+    safely between render processes and runs. Once it holds more than
+    `max_bytes`, the least recently used frames are evicted.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the cached frames. Created if missing.
+    max_bytes : int
+        Size bound of the cache in bytes. [default=2**30 (1 GiB)]
+    """
+
+    def __init__(self, directory, max_bytes=2**30):
+        if not isinstance(max_bytes, int) or max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(self, script_file, **settings):
+        """Cache key of `script_file` rendered with `settings`."""
+        digest = _script_digest(script_file)
+        for name in sorted(settings):
+            digest.update(f"{name}={settings[name]};".encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.png"
+
+    def fetch(self, key, image_file):
+        """Copy the frame cached under `key` to `image_file`.
+
+        Returns
+        -------
+        bool
+            False if no frame is cached under `key`.
+        """
+        cached = self._path(key)
+        try:
+            shutil.copyfile(cached, image_file)
+            os.utime(cached)  # mark as recently used
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store(self, key, image_file):
+        """Add the rendered `image_file` to the cache under `key`."""
+        # Copy to a temporary file first so concurrent readers never see a
+        # partially written frame.
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(descriptor)
+        shutil.copyfile(image_file, temporary)
+        os.replace(temporary, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used frames until the cache fits `max_bytes`."""
+        entries = []
+        for path in self.directory.glob("*.png"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Remove every cached frame."""
+        for path in self.directory.glob("*.png"):
+            path.unlink(missing_ok=True)
+
+
+# POV-Ray statistics reported by `render_povray`: name -> pattern of the
+# value in POV-Ray's statistics output.
+_STATISTICS_PATTERNS = {
+    "parse_time": r"Parse Time:.*?\(([\d.]+) seconds\)",
+    "bounding_time": r"Bounding Time:.*?\(([\d.]+) seconds\)",
+    "photon_time": r"Photon Time:.*?\(([\d.]+) seconds\)",
+    "radiosity_time": r"Radiosity Time:.*?\(([\d.]+) seconds\)",
+    "trace_time": r"Trace Time:.*?\(([\d.]+) seconds\)",
+    "pixels": r"Pixels:\s+(\d+)",
+    "samples": r"Samples:\s+(\d+)",
+    "rays": r"Rays:\s+(\d+)",
+    "saved_rays": r"Saved:\s+(\d+)",
+    "shadow_ray_tests": r"Shadow Ray Tests:\s+(\d+)",
+    "shadow_rays_succeeded": r"Shadow Ray Tests:\s+\d+\s+Succeeded:\s+(\d+)",
+}
+_STATISTICS_PATTERNS = {
+    name: re.compile(pattern) for name, pattern in _STATISTICS_PATTERNS.items()
+}
+
+
+def _parse_povray_statistics(output):
+    """Times (in seconds) and ray counts of POV-Ray's statistics `output`,
+    keyed as `_STATISTICS_PATTERNS`. Statistics missing from the output
+    (e.g. no photons) are left out."""
+    statistics = {}
+    for name, pattern in _STATISTICS_PATTERNS.items():
+        match = pattern.search(output)
+        if match is not None:
+            value = match.group(1)
+            statistics[name] = float(value) if name.endswith("_time") else int(value)
+    return statistics
+
+
+def _sum_statistics(statistics):
+    """Sum of the values of a list of `render_povray` statistics."""
+    total = {}
+    for values in statistics:
+        for name, value in values.items():
+            total[name] = total.get(name, 0) + value
+    return total
+
+
+def _cache_key(
+    cache,
+    filename,
+    width,
+    height,
+    antialias="on",
+    quality=11,
+    transparency=False,
+    antialias_threshold=None,
+    antialias_depth=None,
+):
+    """`cache` key of frame `filename` rendered with the given settings."""
+    # POV-Ray's default antialiasing is left out, so existing keys hold
+    settings = {
+        name: value
+        for name, value in (
+            ("antialias_threshold", antialias_threshold),
+            ("antialias_depth", antialias_depth),
+        )
+        if value is not None
+    }
+    return cache.key(
+        Path(filename).with_suffix(".pov"),
+        width=width,
+        height=height,
+        antialias=antialias,
+        quality=quality,
+        transparency=transparency,
+        **settings,
+    )
+
+
+def _tile_regions(width, height, tiles):
+    """Split a `width`×`height` frame into a grid of `tiles` tiles, as
+    `(start_column, end_column, start_row, end_row)` 1-based inclusive
+    pixel bounds (POV-Ray's +SC/+EC/+SR/+ER), row by row.
+
+    The `tiles` tiles are split evenly between `ceil(tiles / ceil(sqrt(tiles)))`
+    rows. Tiles span at least two pixels each way, so a frame too small for
+    `tiles` is split into fewer tiles, never more.
+    """
+    if not isinstance(tiles, int) or tiles < 1:
+        raise ValueError("tiles must be a positive integer")
+    n_rows = math.ceil(tiles / math.ceil(math.sqrt(tiles)))
+    n_rows = max(min(n_rows, height // 2), 1)
+    rows = [round(j * height / n_rows) for j in range(n_rows + 1)]
+    regions = []
+    for j in range(n_rows):
+        n_columns = tiles * (j + 1) // n_rows - tiles * j // n_rows
+        n_columns = max(min(n_columns, width // 2), 1)
+        columns = [round(i * width / n_columns) for i in range(n_columns + 1)]
+        regions += [
+            (columns[i] + 1, columns[i + 1], rows[j] + 1, rows[j + 1])
+            for i in range(n_columns)
+        ]
+    return regions
+
+
+def _tile_file(filename, region):
+    """Image file of the tile of frame `filename` covering `region`."""
+    base = Path(filename)
+    start_column, _, start_row, _ = region
+    return base.with_name(f"{base.name}_tile_{start_row}_{start_column}.png")
+
+
+def stitch_tiles(filename, width, height, tiles):
+    """Assemble the tiles of frame `filename`, rendered by `render_povray`
+    with the `region`s of `_tile_regions(width, height, tiles)`, into
+    `<filename>.png`, and remove them.
+
+    Pixels are copied as they are (alpha channel included), so the frame
+    is the same as if it was rendered whole. Tiles may be either cropped to
+    their region or frame-sized, depending on the POV-Ray version.
+    """
+    frame = None
+    tile_files = []
+    for region in _tile_regions(width, height, tiles):
+        start_column, end_column, start_row, end_row = region
+        box = (start_column - 1, start_row - 1, end_column, end_row)
+        tile_file = _tile_file(filename, region)
+        with Image.open(tile_file) as tile:
+            if tile.size == (width, height):
+                tile = tile.crop(box)
+            if frame is None:
+                frame = Image.new(tile.mode, (width, height))
+            frame.paste(tile.convert(frame.mode), box[:2])
+        tile_files.append(tile_file)
+    frame.save(Path(filename).with_suffix(".png"))
+    for tile_file in tile_files:
+        tile_file.unlink()
+
+
 def render_povray(
     filename,
     width,
@@ -68,6 +387,13 @@ def render_povray(
     display="Off",
     pov_thread=4,
     transparency=False,
+    cache=None,
+    tiles=1,
+    region=None,
+    antialias_threshold=None,
+    antialias_depth=None,
+    executable=None,
+    tile_processes=None,
 ):
     """Rendering frame
 
@@ -90,11 +416,50 @@ def render_povray(
         Turns display option on/off during POVray rendering. [default='off']
     pov_thread : int
         Number of thread per povray process. [default=4]
-        Acceptable range is (4,512).
+        Acceptable range is (1,512). See `svt.rendering.scheduler` for
+        splitting CPUs between concurrent povray processes.
         Refer 'Symmetric Multiprocessing (SMP)' for further details
         https://www.povray.org/documentation/3.7.0/r3_2.html#r3_2_8_1
     transparency : bool
         If True, enables alpha-channel output (+UA). [default=False]
+    cache : FrameCache or None
+        If given, the image is copied from the cache when the same script
+        was already rendered with the same settings, and stored in it
+        otherwise. [default=None]
+    tiles : int
+        Number of tiles the frame is split into (see `_tile_regions`),
+        rendered by concurrent POV-Ray processes of `pov_thread` threads
+        each, then stitched into the frame (see `stitch_tiles`).
+        [default=1] Single POV-Ray processes scale poorly past a few dozen
+        threads, so large stills render faster as several tiles.
+    region : tuple or None
+        Render only the `(start_column, end_column, start_row, end_row)`
+        1-based inclusive pixel bounds of the frame, into its tile image
+        (`_tile_file`), leaving the stitching to the caller, e.g. tiles
+        rendered on several nodes. [default=None]
+    antialias_threshold : float or None
+        Color difference between neighboring pixels above which a pixel is
+        supersampled. [default=None] If None, POV-Ray's default (0.3).
+    antialias_depth : int or None
+        Supersampling depth, from 1 to 9. [default=None]
+        If None, POV-Ray's default (3).
+    executable : str or None
+        POV-Ray executable. [default=None]
+        If None, located with `_find_povray_executable` (see `RenderEngine`
+        to locate it once for many renders).
+    tile_processes : int or None
+        Number of tiles rendered at once. [default=None]
+        If None, every tile at once. See `schedule_tiles` for splitting
+        CPUs between tiles.
+
+    Returns
+    -------
+    dict
+        Statistics of the render: `cached` (whether the frame was copied
+        from `cache`), `wall_time` (seconds spent in this call), and the
+        parse, bounding, photon, radiosity and trace times (in seconds) and
+        ray counts POV-Ray reports (see `_STATISTICS_PATTERNS`), summed
+        over the tiles of a tiled frame.
 
     Raises
     ------
@@ -104,17 +469,69 @@ def render_povray(
         If the povray run causes unexpected error, such as parsing error,
         this method will raise IOError.
     """
+    start = time.perf_counter()
 
-    if not (4 <= pov_thread <= 512):
-        raise ValueError("pov_thread must be in the range (4, 512).")
+    if not (1 <= pov_thread <= 512):
+        raise ValueError("pov_thread must be in the range (1, 512).")
+    if not isinstance(tiles, int) or tiles < 1:
+        raise ValueError("tiles must be a positive integer")
+    if antialias_depth is not None and not (1 <= antialias_depth <= 9):
+        raise ValueError("antialias_depth must be in the range (1, 9).")
 
     # Use pathlib so extensions/paths are built consistently regardless of OS
     # path separator conventions. `filename` may itself contain a path.
     base = Path(filename)
     script_file = base.with_suffix(".pov")
     image_file = base.with_suffix(".png")
+    if region is not None:
+        # tiles are cached as part of their stitched frame
+        image_file = _tile_file(filename, region)
+        cache = None
+
+    if cache is not None:
+        cache_key = _cache_key(
+            cache,
+            filename,
+            width,
+            height,
+            antialias,
+            quality,
+            transparency,
+            antialias_threshold,
+            antialias_depth,
+        )
+        if cache.fetch(cache_key, image_file):
+            return {"cached": True, "wall_time": time.perf_counter() - start}
+
+    povray_exe = _find_povray_executable() if executable is None else executable
 
-    povray_exe = _find_povray_executable()
+    if tiles > 1 and region is None:
+        render_tile = partial(
+            render_povray,
+            filename,
+            width,
+            height,
+            antialias,
+            quality,
+            display,
+            pov_thread,
+            transparency,
+            antialias_threshold=antialias_threshold,
+            antialias_depth=antialias_depth,
+            executable=povray_exe,
+        )
+        regions = _tile_regions(width, height, tiles)
+        workers = len(regions) if tile_processes is None else tile_processes
+        with ThreadPoolExecutor(max(1, min(workers, len(regions)))) as executor:
+            futures = [
+                executor.submit(render_tile, region=region) for region in regions
+            ]
+            statistics = _sum_statistics([future.result() for future in futures])
+        stitch_tiles(filename, width, height, tiles)
+        if cache is not None:
+            cache.store(cache_key, image_file)
+        statistics.update(cached=False, wall_time=time.perf_counter() - start)
+        return statistics
 
     # Build the argument list, dropping any falsy/empty entries so an
     # unused flag doesn't get passed as a literal empty string argument
@@ -132,7 +549,23 @@ def render_povray(
         f"Antialias={antialias}",
         f"Quality={quality}",
         f"Display={display}",
+        (
+            f"Antialias_Threshold={antialias_threshold}"
+            if antialias_threshold is not None
+            else None
+        ),
+        f"Antialias_Depth={antialias_depth}" if antialias_depth is not None else None,
     ]
+    if region is not None:
+        # POV-Ray reads bounds of at most 1 as fractions of the frame, so
+        # only the bounds other than the frame's own are passed, in pixels.
+        start_column, end_column, start_row, end_row = region
+        cmds += [
+            f"+SC{start_column}" if start_column > 1 else None,
+            f"+EC{end_column}" if end_column < width else None,
+            f"+SR{start_row}" if start_row > 1 else None,
+            f"+ER{end_row}" if end_row < height else None,
+        ]
     cmds = [c for c in cmds if c]
 
     # On Windows, the GUI-based pvengine needs explicit flags to run
@@ -161,3 +594,125 @@ def render_povray(
         raise IOError(
             "POVRay rendering failed with the following error: " + stderr_text
         )
+
+    if cache is not None:
+        cache.store(cache_key, image_file)
+
+    # POV-Ray prints its statistics to stderr (stdout on some builds)
+    statistics = _parse_povray_statistics(
+        result.stderr.decode(errors="replace") + result.stdout.decode(errors="replace")
+    )
+    statistics.update(cached=False, wall_time=time.perf_counter() - start)
+    return statistics
+
+
+def _render(filename, settings):
+    """Pool task of `RenderEngine`: render one frame, return its file path."""
+    render_povray(filename, **settings)
+    return filename
+
+
+class RenderEngine:
+    """Long-lived POV-Ray renderer: locates the executable once and keeps a
+    pool of render processes alive across renders, so that services
+    rendering many short clips do not pay these costs on every request.
+
+    Frames are submitted one by one (`submit`) or in batches (`map`), and
+    `Scene.render_frames`/`render_video` render on the engine's pool when
+    given `engine=`. The pool is started on first use and stopped by
+    `close` (or at the end of a `with` block).
+
+    Parameters
+    ----------
+    processes : int or None
+        Number of concurrent POV-Ray processes. [default=None]
+    pov_thread : int or None
+        Work threads of each POV-Ray process. [default=None]
+        If either is None, it is picked by `schedule_render` from the CPUs
+        available to this process.
+    executable : str or None
+        POV-Ray executable. [default=None]
+        If None, located once with `_find_povray_executable`.
+
+    Attributes
+    ----------
+    processes, pov_thread : int
+        Concurrent POV-Ray processes and the threads of each.
+    executable : str
+        POV-Ray executable of every render.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no POV-Ray executable can be located on the system.
+    """
+
+    def __init__(self, processes=None, pov_thread=None, executable=None):
+        self.executable = (
+            _find_povray_executable() if executable is None else executable
+        )
+        self.processes, self.pov_thread = schedule_render(
+            available_cpus(), processes, pov_thread
+        )
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def pool(self):
+        """The engine's process pool, started on first access."""
+        if self._pool is None:
+            self._pool = Pool(self.processes)
+        return self._pool
+
+    def settings(self, **settings):
+        """`render_povray` settings with the engine's executable and
+        threads, unless given."""
+        return {
+            "executable": self.executable,
+            "pov_thread": self.pov_thread,
+            **settings,
+        }
+
+    def submit(self, filename, callback=None, error_callback=None, **settings):
+        """Render frame `filename` (see `render_povray`, whose other
+        arguments are given as keywords) on the pool.
+
+        Parameters
+        ----------
+        filename : str
+            POV filename (without extension).
+        callback, error_callback : callable or None
+            Called with `filename` once the frame is rendered, or with the
+            exception raised by the render. [default=None]
+
+        Returns
+        -------
+        multiprocessing.pool.AsyncResult
+            Result whose `get()` returns `filename` once rendered.
+        """
+        return self.pool.apply_async(
+            _render,
+            (filename, self.settings(**settings)),
+            callback=callback,
+            error_callback=error_callback,
+        )
+
+    def map(self, filenames, **settings):
+        """Render every frame of `filenames` on the pool (see `submit`),
+        yielding each file path as its frame is rendered, in completion
+        order."""
+        return self.pool.imap_unordered(
+            partial(_render, settings=self.settings(**settings)), filenames
+        )
+
+    def close(self):
+        """Stop the pool once its queued renders are done."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
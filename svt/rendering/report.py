@@ -0,0 +1,207 @@
+"""
+
+This module collects where the time of a render goes: the scripting time
+and script size of every object type and frame, and the statistics POV-Ray
+reports for every rendered frame (see `RenderReport`).
+
+"""
+
+import csv
+import json
+import os
+import time
+from collections import defaultdict
+
+# Columns of the frame records, in report order; POV-Ray statistics a frame
+# does not report are left empty.
+FRAME_FIELDS = (
+    "file_path",
+    "camera",
+    "script_bytes",
+    "script_time",
+    "repeat_of",
+    "cached",
+    "wall_time",
+    "parse_time",
+    "bounding_time",
+    "photon_time",
+    "radiosity_time",
+    "trace_time",
+    "pixels",
+    "samples",
+    "rays",
+    "saved_rays",
+    "shadow_ray_tests",
+    "shadow_rays_succeeded",
+)
+
+
+class _ScriptStatistics:
+    """Scripting times and sizes gathered while frames are scripted, merged
+    into a `RenderReport` (from the scripting workers too, see `take`)."""
+
+    def __init__(self):
+        # object type -> [generate_script calls, seconds, script characters]
+        self.objects = defaultdict(lambda: [0, 0.0, 0])
+        # file path -> (script characters, seconds)
+        self.frames = {}
+
+    def record_object(self, type_name, seconds, size):
+        values = self.objects[type_name]
+        values[0] += 1
+        values[1] += seconds
+        values[2] += size
+
+    def record_frame(self, file_path, size, seconds):
+        self.frames[file_path] = (size, seconds)
+
+    def take(self):
+        """`(objects, frames)` recorded since the last call, as plain
+        (picklable) dicts, and reset."""
+        taken = (dict(self.objects), self.frames)
+        self.__init__()
+        return taken
+
+
+class RenderReport:
+    """Instrumentation of renders: scripting time and size per object type
+    and per frame, and POV-Ray's parse, bounding and trace times and ray
+    counts per rendered frame.
+
+    Pass a report to `Scene.render_frames`/`render_video` as `report=`;
+    several renders may share one. Write it with `write` as JSON (summary,
+    object types and frames) or CSV (one row per frame).
+
+    Parameters
+    ----------
+    callback : callable or None
+        `callback(event, data)`, e.g. to feed a metrics system, called with
+        `("frame", record)` as each frame is rendered (see `frames`) and
+        with `("render", summary)` at the end of every render (see
+        `summary`). [default=None]
+
+    Attributes
+    ----------
+    frames : list
+        One record per rendered or repeated frame, a dict of `FRAME_FIELDS`.
+        Repeated frames (identical to the previous frame of their camera)
+        are not rendered and only have their script statistics and
+        `repeat_of` set.
+    objects : dict
+        Object type -> `{"calls", "script_time", "script_bytes"}` of its
+        `generate_script` calls, summed over every frame.
+    setup : dict
+        Scripting done once per render rather than per frame, i.e. the
+        "static_includes" of time-invariant lights and objects and the
+        "object_includes" of time-invariant parts of objects (e.g. mesh
+        topology) -> `{"script_time", "script_bytes"}`, summed over every
+        render.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.frames = []
+        self.objects = {}
+        self.setup = {}
+        self._scripts = {}
+        self._renders = 0
+        self._render_wall_time = 0.0
+        self._start = None
+
+    def summary(self):
+        """Totals of the report: numbers of frames, scripting time and
+        script bytes (of the frames and the `setup`, which is also given
+        alone as `setup_time` and `setup_bytes`), wall time of the renders,
+        and the sums of POV-Ray's times and ray counts over the rendered
+        frames."""
+        rendered = [record for record in self.frames if record["repeat_of"] is None]
+        setup_time = sum(values["script_time"] for values in self.setup.values())
+        setup_bytes = sum(values["script_bytes"] for values in self.setup.values())
+        script_time = sum(record["script_time"] or 0 for record in self.frames)
+        script_bytes = sum(record["script_bytes"] or 0 for record in self.frames)
+        summary = {
+            "renders": self._renders,
+            "wall_time": self._render_wall_time,
+            "frames": len(self.frames),
+            "rendered_frames": len(rendered),
+            "cached_frames": sum(bool(record["cached"]) for record in rendered),
+            "script_time": setup_time + script_time,
+            "script_bytes": setup_bytes + script_bytes,
+            "setup_time": setup_time,
+            "setup_bytes": setup_bytes,
+        }
+        for field in FRAME_FIELDS[FRAME_FIELDS.index("parse_time") :]:
+            summary[field] = sum(record[field] or 0 for record in rendered)
+        return summary
+
+    def write(self, filename):
+        """Write the report to `filename`: as CSV (one row per frame) if it
+        ends with ".csv", as JSON otherwise."""
+        if os.path.splitext(filename)[1].lower() == ".csv":
+            with open(filename, "w", newline="") as f:
+                writer = csv.DictWriter(f, FRAME_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.frames)
+        else:
+            report = {
+                "summary": self.summary(),
+                "setup": self.setup,
+                "objects": self.objects,
+                "frames": self.frames,
+            }
+            with open(filename, "w") as f:
+                json.dump(report, f, indent=2)
+
+    def _start_render(self):
+        self._start = time.perf_counter()
+
+    def _finish_render(self):
+        self._renders += 1
+        self._render_wall_time += time.perf_counter() - self._start
+        if self.callback is not None:
+            self.callback("render", self.summary())
+
+    def _record_setup(self, name, seconds, size):
+        """Add `seconds` and `size` characters of scripting to the `name`
+        entry of `setup`."""
+        values = self.setup.setdefault(name, {"script_time": 0.0, "script_bytes": 0})
+        values["script_time"] += seconds
+        values["script_bytes"] += size
+
+    def _record_scripts(self, statistics):
+        """Merge the `_ScriptStatistics.take()` of a scripting process."""
+        objects, frames = statistics
+        for type_name, (calls, seconds, size) in objects.items():
+            values = self.objects.setdefault(
+                type_name, {"calls": 0, "script_time": 0.0, "script_bytes": 0}
+            )
+            values["calls"] += calls
+            values["script_time"] += seconds
+            values["script_bytes"] += size
+        self._scripts.update(frames)
+
+    def _record_frame(self, file_path, statistics=None, repeat_of=None):
+        """Add the record of frame `file_path`, rendered with the
+        `render_povray` `statistics`, or a repeat of frame `repeat_of`."""
+        size, seconds = self._scripts.pop(file_path, (None, None))
+        record = dict.fromkeys(FRAME_FIELDS)
+        record.update(
+            file_path=file_path,
+            camera=os.path.basename(os.path.dirname(file_path)),
+            script_bytes=size,
+            script_time=seconds,
+            repeat_of=repeat_of,
+        )
+        if statistics is not None:
+            record.update(
+                (name, value) for name, value in statistics.items() if name in record
+            )
+        self.frames.append(record)
+        if self.callback is not None:
+            self.callback("frame", record)
+
+    def _record_repeats(self, repeats):
+        """Add the records of the `(rendered_file_path, repeated_file_path)`
+        frames skipped by `Scene._skip_repeated_frames`."""
+        for rendered_file_path, repeated_file_path in repeats:
+            self._record_frame(repeated_file_path, repeat_of=rendered_file_path)
@@ -1,20 +1,58 @@
-import multiprocessing
 import os
+import shutil
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+from fractions import Fraction
+from time import perf_counter
 from functools import partial
+from glob import escape as glob_escape, glob
 from multiprocessing import Pool
 from tqdm import tqdm
 from numbers import Real
 from svt.rendering.stage import Stage
-from svt.rendering.renderer import render_povray
+from svt.rendering.renderer import (
+    RENDER_PROFILES,
+    FrameCache,
+    render_povray,
+    _script_digest,
+)
+from svt.rendering.report import _ScriptStatistics
+from svt.rendering.scheduler import available_cpus, schedule_render, schedule_tiles
+from svt.rendering.encoder import VideoEncoder
+from svt.rendering.keyframes import Keyframes
+from svt.rendering.data_sources import NpySource
 from svt.rendering.utils import (
     TimeScalar,
     TimeVecN,
+    TimeIndexN,
+    TimeIndexMN,
     _wrapped_property,
     _bool_property,
     _extension_from_path,
+    _pov_include,
+    _time_callables,
 )
 import dill
 import gzip
+import json
+import numpy as np
+
+# Memory budget of the values precomputed by `Scene._precomputed_values`.
+_PRECOMPUTE_MAX_BYTES = 2**28
+
+# Relative widening of the camera frustum used by `Scene._frustum_culling`.
+_CULLING_PADDING = 0.1
+
+# Memory budget of each chunk of frames evaluated by `Scene.export`.
+_BAKE_CHUNK_BYTES = 2**26
+
+# Version of the baked scene archive written by `Scene.export`.
+_BAKED_FORMAT_VERSION = 1
+
+# Memory budget of the object scripts shared between cameras by
+# `Scene._shared_scripts`.
+_SCRIPT_MEMO_MAX_BYTES = 2**26
 
 
 class Scene(Stage):
@@ -25,6 +63,9 @@ class Scene(Stage):
     ) -> None:
         Stage.__init__(self)
         self.objects = []
+        self._script_memo = None
+        self._culling_aspect_ratio = None
+        self._lod_pixel_error = None
 
     class Object(Stage.Object):
         """Base class for every renderable POV-Ray object.
@@ -34,6 +75,10 @@ class Scene(Stage):
         `generate_script` calls to render its `texture { ... }` block.
         """
 
+        # Defaults of objects pickled by older versions (see `Scene.load`)
+        _cullable = True
+        _lod = 0
+
         def __init__(self):
             super().__init__()
             self.color = TimeVecN([1, 0, 0])
@@ -42,6 +87,8 @@ class Scene(Stage):
             self.finish = self.Finish()
             self.image_map = self.ImageMap()
             self.bump_map = self.BumpMap()
+            self.cullable = True
+            self._lod = 0
 
         def generate_texture_script(self, time):
             """Build this object's `texture { pigment { ... } normal { ... } finish { ... } }` block."""
@@ -59,8 +106,38 @@ class Scene(Stage):
             lines.append("}")
             return "\n".join(lines)
 
+        def bounding_sphere(self, time):
+            """Conservative `(center, radius)` bounding sphere of the object
+            at `time`, used for frustum culling, or None if unbounded or
+            unknown (the object is then never culled)."""
+            return None
+
+        def lod_level(self, time, max_error):
+            """Coarsest level of detail of the object at `time` whose
+            geometric error is at most `max_error` (in scene units), 0 being
+            the full detail. `generate_script` scripts the level set in
+            `_lod` (see `Scene._level_of_detail`)."""
+            return 0
+
+        def write_includes(self, path_prefix, time):
+            """Write the time-invariant parts of this object's script to
+            `<path_prefix>_*.inc` files, for `generate_script` to `#include`
+            instead of re-scripting them every frame.
+
+            Called by Scene on time-dependent objects before scripting a
+            render, and undone by `clear_includes` afterwards. Objects with
+            no such parts leave this as a no-op.
+            """
+
+        def clear_includes(self):
+            """Make `generate_script` self-contained again."""
+
         color = _wrapped_property("color", TimeVecN, [0, 0, 0])
         transmit = _wrapped_property("transmit", TimeScalar, 0)
+        # Whether frustum culling may drop the object from the frames of a
+        # camera that does not see it. Opt out for objects that matter
+        # through shadows or reflections while out of view.
+        cullable = _bool_property("cullable", True)
 
         @property
         def precision(self):
@@ -238,23 +315,124 @@ class Scene(Stage):
                 "iridescence_turbulence", TimeScalar, 0
             )
 
-    def export(self, filename: str):
-        with gzip.open(filename + ".gz", "wb") as file:
-            dill.dump(
-                [
-                    self.objects,
-                    self.cameras,
-                    self.lights,
-                    self._light_assign,
-                    self.background,
-                ],
-                file,
-            )
+    def export(self, filename: str, times=None):
+        """Save the scene to disk.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the saved scene. Without `times`, the scene is pickled
+            with dill into `<filename>.gz`; otherwise a baked archive is
+            written to the directory `filename`.
+        times : list or None
+            Frame schedule to bake. [default=None]
+            If given, every time-dependent attribute is evaluated at these
+            times and stored as a raw `.npy` array (one row per time) next
+            to a `meta.json` header and a dill skeleton of the scene without
+            the original callables. Loading the archive memory-maps the
+            arrays, so each render process only reads the frames it
+            renders. The loaded scene holds each baked value until the next
+            baked time.
+        """
+        if times is None:
+            with gzip.open(filename + ".gz", "wb") as file:
+                dill.dump(
+                    [
+                        self.objects,
+                        self.cameras,
+                        self.lights,
+                        self._light_assign,
+                        self.background,
+                    ],
+                    file,
+                )
+            return
+
+        times = np.asarray(times, dtype=float)
+        if times.ndim != 1 or len(times) == 0:
+            raise ValueError("times must be a non-empty 1D sequence")
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("times must be strictly increasing")
+        os.makedirs(os.path.join(filename, "arrays"), exist_ok=True)
+
+        owners = [self.background, *self.cameras, *self.lights, *self.objects]
+        baked = []  # (TimeCallable, original array, original callable)
+        arrays = []
+        try:
+            for owner in owners:
+                for value in _time_callables(owner):
+                    if value.is_constant:
+                        continue
+                    array_file = f"{len(arrays):04d}.npy"
+                    shape, dtype = _bake(
+                        value, times, os.path.join(filename, "arrays", array_file)
+                    )
+                    arrays.append(
+                        {"file": array_file, "shape": shape, "dtype": str(dtype)}
+                    )
+                    baked.append((value, value.array, value._callable_array))
+                    value.array = value._callable_array = _BakedValue(array_file)
+
+            with open(os.path.join(filename, "scene.dill"), "wb") as file:
+                dill.dump(
+                    [
+                        self.objects,
+                        self.cameras,
+                        self.lights,
+                        self._light_assign,
+                        self.background,
+                    ],
+                    file,
+                )
+        finally:
+            for value, array, callable_array in baked:
+                value.array = array
+                value._callable_array = callable_array
+
+        meta = {
+            "format": "svt-baked-scene",
+            "version": _BAKED_FORMAT_VERSION,
+            "times": times.tolist(),
+            "arrays": arrays,
+        }
+        with open(os.path.join(filename, "meta.json"), "w") as file:
+            json.dump(meta, file, indent=1)
 
     @staticmethod
     def load(filename: str):
-        with gzip.open(filename, "rb") as file:
-            scene_attributes = dill.load(file)
+        """Load a scene saved by `export`, either a `.gz` file or a baked
+        archive directory (whose arrays are memory-mapped, not read)."""
+        if not os.path.isdir(filename):
+            with gzip.open(filename, "rb") as file:
+                scene_attributes = dill.load(file)
+        else:
+            with open(os.path.join(filename, "meta.json")) as file:
+                meta = json.load(file)
+            if meta.get("format") != "svt-baked-scene":
+                raise ValueError(f"{filename} is not a baked scene archive")
+            if meta["version"] > _BAKED_FORMAT_VERSION:
+                raise ValueError(
+                    f"{filename} was written by a newer version of svt "
+                    f"(format version {meta['version']})"
+                )
+            with open(os.path.join(filename, "scene.dill"), "rb") as file:
+                scene_attributes = dill.load(file)
+            times = np.asarray(meta["times"])
+            for owner in [
+                *scene_attributes[0],
+                *scene_attributes[1],
+                *scene_attributes[2],
+                scene_attributes[4],
+            ]:
+                for value in _time_callables(owner):
+                    if isinstance(value._callable_array, _BakedValue):
+                        array_file = value._callable_array.array_file
+                        value.array = value._callable_array = Keyframes(
+                            times,
+                            NpySource(os.path.join(filename, "arrays", array_file)),
+                            "step",
+                        )
+
         loaded_scene = Scene()
         for attribute_name, attribute in zip(
             ["objects", "cameras", "lights", "_light_assign", "background"],
@@ -270,6 +448,607 @@ class Scene(Stage):
             )
         self.objects.append(item)
 
+    def set_render_mode(self, render_mode):
+        """Set the `render_mode` of every object offering it among its
+        `RENDER_MODES`, e.g. ``scene.set_render_mode("mesh")`` tessellates
+        every SphereSweep.
+
+        Returns
+        -------
+        int
+            Number of objects switched.
+        """
+        switched = 0
+        for scene_object in self.objects:
+            if render_mode in getattr(scene_object, "RENDER_MODES", ()):
+                scene_object.render_mode = render_mode
+                switched += 1
+        return switched
+
+    def generate_frame_script(self, camera_id, time, static_include=None):
+        """Build the full POV-Ray script of one frame seen from `cameras[camera_id]`.
+
+        If `static_include` is given, the time-invariant lights and objects
+        (see `Stage.Object.is_static`) are left out of the script and the
+        file written by `_write_static_includes` is `#include`d instead.
+        Within `_frustum_culling`, the time-dependent objects the camera
+        does not see are left out, and within `_level_of_detail` they are
+        scripted at the level of detail the camera needs.
+        """
+        camera = self.cameras[camera_id]
+        light_ids = self._light_assign[camera_id] + self._light_assign[-1]
+        memo = getattr(self, "_script_memo", None)
+        if memo is None:
+            memo = _ScriptMemo(0)
+        statistics = getattr(self, "_script_statistics", None)
+        frame_script = [self.background.generate_script(time)]
+
+        # update and append camera
+        camera.generate_script(time)
+        frame_script.append(str(camera))
+
+        # update and append lights
+        for light_id in light_ids:  # Script Lightings
+            if static_include is not None and self.lights[light_id].is_static():
+                continue
+            frame_script.append(
+                memo.script(
+                    ("light", light_id), self.lights[light_id], time, statistics
+                )
+            )
+
+        # append time-invariant lights and objects
+        if static_include is not None:
+            frame_script.append(_pov_include(static_include))
+
+        # append scene objects
+        aspect_ratio = getattr(self, "_culling_aspect_ratio", None)
+        for index, scene_object in enumerate(self.objects):
+            if static_include is not None and scene_object.is_static():
+                continue
+            if aspect_ratio is not None and self._is_culled(
+                camera, scene_object, time, aspect_ratio
+            ):
+                continue
+            level = self._lod_level(camera, scene_object, time)
+            scene_object._lod = level
+            try:
+                frame_script.append(
+                    memo.script(
+                        ("object", index, level), scene_object, time, statistics
+                    )
+                )
+            finally:
+                scene_object._lod = 0
+
+        return "\n".join(frame_script)
+
+    def _write_static_includes(self, output_images_directory, name, time, report=None):
+        """Script the time-invariant lights and objects once, into one
+        `<name>_static.inc` file per camera directory, recording the time
+        and size in `report` (if given) as its "static_includes" setup.
+
+        Returns
+        -------
+        dict
+            Include file path of every camera that has time-invariant
+            lights or objects.
+        """
+        start = perf_counter()
+        size = 0
+        static_objects = []
+        for scene_object in self.objects:
+            if scene_object.is_static():
+                scene_object.generate_script(time)
+                static_objects.append(str(scene_object))
+
+        static_includes = {}
+        for camera_id, camera in enumerate(self.cameras):
+            static_script = []
+            for light_id in self._light_assign[camera_id] + self._light_assign[-1]:
+                if self.lights[light_id].is_static():
+                    self.lights[light_id].generate_script(time)
+                    static_script.append(str(self.lights[light_id]))
+            static_script.extend(static_objects)
+            if not static_script:
+                continue
+
+            include_path = os.path.join(
+                output_images_directory, camera.name, f"{name}_static.inc"
+            )
+            with open(include_path, "w+") as f:
+                size += f.write("\n".join(static_script))
+            static_includes[camera_id] = include_path
+        if report is not None:
+            report._record_setup("static_includes", perf_counter() - start, size)
+        return static_includes
+
+    @contextmanager
+    def _object_includes(self, output_images_directory, name, time, report=None):
+        """Context in which every time-dependent object `#include`s the
+        time-invariant parts of its script (see `Scene.Object.write_includes`)
+        from `<name>_object_<index>_*.inc` files, recording the time and
+        size of writing them in `report` (if given) as its "object_includes"
+        setup."""
+        start = perf_counter()
+        size = 0
+        for index, scene_object in enumerate(self.objects):
+            if not scene_object.is_static():
+                path_prefix = os.path.join(
+                    output_images_directory, f"{name}_object_{index:04d}"
+                )
+                scene_object.write_includes(path_prefix, time)
+                size += sum(
+                    os.path.getsize(include_path)
+                    for include_path in glob(glob_escape(path_prefix) + "_*.inc")
+                )
+        if report is not None:
+            report._record_setup("object_includes", perf_counter() - start, size)
+        try:
+            yield
+        finally:
+            for scene_object in self.objects:
+                scene_object.clear_includes()
+
+    @contextmanager
+    def _precomputed_values(self, times):
+        """Context in which every vectorized TimeCallable of the stage and
+        objects is evaluated over all of `times` in one call up front (see
+        `TimeCallable.precompute`), as long as the values fit in
+        `_PRECOMPUTE_MAX_BYTES`. Values that do not fit (e.g. the vertices
+        of a large mesh streamed from a `DataSource`) are left to be
+        evaluated frame by frame."""
+        owners = [self.background, *self.cameras, *self.lights, *self.objects]
+        budget = _PRECOMPUTE_MAX_BYTES
+        precomputed = []
+        try:
+            for owner in owners:
+                for value in _time_callables(owner):
+                    if value.is_constant or not value.vectorized or len(times) == 0:
+                        continue
+                    size = np.asarray(value(times[0])).nbytes * len(times)
+                    if size > budget:
+                        continue
+                    precomputed.append(value)
+                    budget -= value.precompute(times)
+            yield
+        finally:
+            for value in precomputed:
+                value.clear_precomputed()
+
+    @staticmethod
+    def _is_culled(camera, scene_object, time, aspect_ratio):
+        """Whether `scene_object` is out of `camera`'s (padded) view."""
+        if not scene_object.cullable:
+            return False
+        bounding_sphere = scene_object.bounding_sphere(time)
+        if bounding_sphere is None:
+            return False
+        center, radius = bounding_sphere
+        return not camera.sees_sphere(
+            time, center, radius, aspect_ratio, _CULLING_PADDING
+        )
+
+    @contextmanager
+    def _frustum_culling(self, width, height, enabled=True):
+        """Context in which `generate_frame_script` drops the time-dependent
+        objects outside each camera's view of a `width`×`height` image.
+
+        Time-invariant objects are scripted once for every frame (see
+        `_write_static_includes`), so they are never culled.
+        """
+        if not enabled:
+            yield
+            return
+        self._culling_aspect_ratio = width / height
+        try:
+            yield
+        finally:
+            self._culling_aspect_ratio = None
+
+    def _lod_level(self, camera, scene_object, time):
+        """Level of detail of `scene_object` seen from `camera`, within
+        `_level_of_detail`: the coarsest level whose geometric error spans
+        at most the pixel error budget at the object's nearest depth."""
+        if getattr(self, "_lod_pixel_error", None) is None:
+            return 0
+        bounding_sphere = scene_object.bounding_sphere(time)
+        if bounding_sphere is None:
+            return 0
+        width, pixel_error = self._lod_pixel_error
+        center, radius = bounding_sphere
+        location, direction, _, _ = camera.view_basis(time)
+        depth = (np.asarray(center) - location) @ direction - radius
+        if depth <= 0:
+            return 0
+        pixel_size = 2 * depth * np.tan(np.radians(camera.angle) / 2) / width
+        return scene_object.lod_level(time, pixel_error * pixel_size)
+
+    @contextmanager
+    def _level_of_detail(self, width, pixel_error=None):
+        """Context in which `generate_frame_script` scripts the time-dependent
+        objects at the coarsest level of detail whose geometric error, seen
+        by each camera in a `width` pixels wide image, is at most
+        `pixel_error` pixels (see `Scene.Object.lod_level`)."""
+        if pixel_error is None:
+            yield
+            return
+        if not isinstance(pixel_error, Real) or pixel_error <= 0:
+            raise ValueError("lod_pixel_error must be a positive number")
+        self._lod_pixel_error = (width, pixel_error)
+        try:
+            yield
+        finally:
+            self._lod_pixel_error = None
+
+    @contextmanager
+    def _shared_scripts(self):
+        """Context in which the light and object scripts of a frame are
+        scripted once and reused by every camera (see `_ScriptMemo`)."""
+        if len(self.cameras) < 2:
+            yield
+            return
+        self._script_memo = _ScriptMemo(_SCRIPT_MEMO_MAX_BYTES)
+        try:
+            yield
+        finally:
+            self._script_memo = None
+
+    @contextmanager
+    def _instrumented(self, report=None):
+        """Context in which the scripting time and size of every object
+        type and frame are recorded (see `RenderReport`), if `report`."""
+        if report is None:
+            yield
+            return
+        self._script_statistics = _ScriptStatistics()
+        try:
+            yield
+        finally:
+            self._script_statistics = None
+
+    def _frame_jobs(self, output_images_directory, times, name):
+        """List a `(camera_id, time, file_path)` scripting job for every frame
+        of every camera, creating each camera's output directory.
+
+        Jobs are ordered time by time, so the views of a frame are scripted
+        one after the other and share their object scripts (see
+        `_shared_scripts`).
+        """
+        output_paths = []
+        for camera in self.cameras:
+            output_paths.append(os.path.join(output_images_directory, camera.name))
+            os.makedirs(output_paths[-1], exist_ok=True)
+        jobs = []
+        for frame_number, time in enumerate(times):
+            for camera_id, output_path in enumerate(output_paths):
+                file_path = os.path.join(
+                    output_path, "{0}_{1:04d}".format(name, frame_number)
+                )
+                jobs.append((camera_id, time, file_path))
+        return jobs
+
+    def _write_frame_scripts(self, jobs, static_includes=None):
+        """Write the .pov script of every job and return how many were
+        written, with the scripting statistics taken from `_instrumented`
+        (None outside of it)."""
+        static_includes = {} if static_includes is None else static_includes
+        statistics = getattr(self, "_script_statistics", None)
+        for camera_id, time, file_path in jobs:
+            start = perf_counter()
+            pov_script = self.generate_frame_script(
+                camera_id, time, static_includes.get(camera_id)
+            )
+            if statistics is not None:
+                statistics.record_frame(
+                    file_path, len(pov_script), perf_counter() - start
+                )
+            with open(file_path + ".pov", "w+") as f:
+                f.write(pov_script)
+        return len(jobs), None if statistics is None else statistics.take()
+
+    def _iter_scripted_frames(
+        self,
+        jobs,
+        scripting_workers=1,
+        chunk_size=None,
+        static_includes=None,
+        report=None,
+    ):
+        """Write the .pov script of every job, optionally on a process pool,
+        yielding each file path (without extension) once its script is written.
+
+        Frames are yielded in job order, and scripting only runs ahead of the
+        consumer by a couple of chunks per worker, so a slow consumer (e.g.
+        the render queue of `_render_pipelined`) throttles scripting.
+
+        Parameters
+        ----------
+        jobs : list
+            `(camera_id, time, file_path)` tuples, see `_frame_jobs`.
+        scripting_workers : int
+            Number of scripting processes. [default=1]
+            With more than one worker, the jobs are split into chunks and the
+            scene is shipped (with dill, so lambdas survive) to every worker.
+        chunk_size : int or None
+            Number of frames scripted per task, rounded up to whole time
+            steps so that the views of a frame share their object scripts
+            (see `_shared_scripts`). [default=None]
+            If None, every worker receives about four chunks.
+        static_includes : dict or None
+            Camera id to shared include file of time-invariant lights and
+            objects, see `_write_static_includes`. [default=None]
+        report : RenderReport or None
+            Report receiving the scripting statistics of every frame before
+            it is yielded, within `_instrumented`. [default=None]
+        """
+        if not isinstance(scripting_workers, int) or scripting_workers < 1:
+            raise ValueError("scripting_workers must be a positive integer")
+
+        pbar = tqdm(total=len(jobs), desc="Scripting")  # Progress Bar
+        if scripting_workers > 1 and len(jobs) > 1:
+            if chunk_size is None:
+                chunk_size = -(-len(jobs) // (4 * scripting_workers))
+            # jobs are ordered time by time, one per camera
+            views = max(1, len(self.cameras))
+            chunk_size = -(-chunk_size // views) * views
+            chunks = [
+                jobs[start : start + chunk_size]
+                for start in range(0, len(jobs), chunk_size)
+            ]
+            with Pool(
+                min(scripting_workers, len(chunks)),
+                initializer=_init_scripting_worker,
+                initargs=(dill.dumps(self),),
+            ) as p:
+                func = partial(_script_chunk, static_includes=static_includes)
+                in_flight = deque()
+                for chunk in chunks:
+                    in_flight.append((chunk, p.apply_async(func, (chunk,))))
+                    if len(in_flight) < 2 * scripting_workers:
+                        continue
+                    done_chunk, result = in_flight.popleft()
+                    pbar.update(self._merge_script_statistics(result.get(), report))
+                    yield from (file_path for _, _, file_path in done_chunk)
+                while in_flight:
+                    done_chunk, result = in_flight.popleft()
+                    pbar.update(self._merge_script_statistics(result.get(), report))
+                    yield from (file_path for _, _, file_path in done_chunk)
+        else:
+            for job in jobs:
+                pbar.update(
+                    self._merge_script_statistics(
+                        self._write_frame_scripts([job], static_includes), report
+                    )
+                )
+                yield job[2]
+        pbar.close()
+
+    @staticmethod
+    def _merge_script_statistics(result, report):
+        """Pass the scripting statistics of a `_script_chunk` result to
+        `report` (if any) and return its number of written scripts."""
+        count, statistics = result
+        if report is not None and statistics is not None:
+            report._record_scripts(statistics)
+        return count
+
+    @staticmethod
+    def _skip_repeated_frames(scripted_frames, repeats, on_repeat=None):
+        """Yield the frames of `scripted_frames` whose script differs from the
+        previous frame of the same camera.
+
+        Every skipped frame is appended to `repeats` as a
+        `(rendered_file_path, repeated_file_path)` pair, to be filled in by
+        `_copy_repeated_frames` once the rendered frame exists, and passed
+        to `on_repeat(rendered_file_path, repeated_file_path)` if given.
+        """
+        previous = {}  # camera directory -> (file_path, digest)
+        # the includes are written before the frames, so their digests are
+        # shared by the frames of this render (and only this render)
+        include_digests = {}
+        for file_path in scripted_frames:
+            directory = os.path.dirname(file_path)
+            digest = _script_digest(file_path + ".pov", include_digests).digest()
+            if directory in previous and previous[directory][1] == digest:
+                repeats.append((previous[directory][0], file_path))
+                if on_repeat is not None:
+                    on_repeat(previous[directory][0], file_path)
+                continue
+            previous[directory] = (file_path, digest)
+            yield file_path
+
+    @staticmethod
+    def _copy_repeated_frames(repeats, keep_scripts=True):
+        """Copy each rendered image onto the frames that repeat it."""
+        for rendered_file_path, repeated_file_path in repeats:
+            shutil.copyfile(rendered_file_path + ".png", repeated_file_path + ".png")
+            if not keep_scripts:
+                os.remove(repeated_file_path + ".pov")
+
+    @staticmethod
+    def _frame_cache(frame_cache):
+        """Accept a FrameCache, a cache directory or None."""
+        if frame_cache is None or isinstance(frame_cache, FrameCache):
+            return frame_cache
+        return FrameCache(frame_cache)
+
+    @staticmethod
+    def _render_pipelined(
+        scripted_frames,
+        render,
+        n_agents,
+        max_queued_frames,
+        keep_scripts=True,
+        on_rendered=None,
+        engine=None,
+        report=None,
+    ):
+        """Render frames on a pool of `n_agents` while they are still being
+        scripted.
+
+        `scripted_frames` is consumed lazily: at most `max_queued_frames`
+        scripted frames wait for (or are in) rendering at any time, and the
+        producer blocks until a render finishes, which bounds the number of
+        .pov scripts on disk. Wall time approaches max(scripting, rendering)
+        rather than their sum.
+
+        Parameters
+        ----------
+        scripted_frames : iterable
+            File paths (without extension) of written scripts, e.g. from
+            `_iter_scripted_frames`.
+        render : callable
+            `render(file_path)`, run on the pool for every frame.
+        n_agents : int
+            Number of parallel renders.
+        max_queued_frames : int
+            Bound of the scripted-but-not-rendered frame queue.
+        keep_scripts : bool
+            If False, each .pov script is deleted once its frame is rendered.
+            [default=True]
+        on_rendered : callable or None
+            `on_rendered(file_path)`, called as each frame finishes rendering.
+            [default=None]
+        engine : RenderEngine or None
+            Engine whose pool renders the frames. [default=None]
+            If None, a pool is started for this render.
+        report : RenderReport or None
+            Report recording the statistics of every rendered frame.
+            [default=None]
+        """
+        if not isinstance(max_queued_frames, int) or max_queued_frames < 1:
+            raise ValueError("max_queued_frames must be a positive integer")
+
+        queue_slots = threading.BoundedSemaphore(max_queued_frames)
+        errors = []
+        pbar = tqdm(desc="Rendering")  # Progress Bar
+
+        def on_frame_rendered(result):
+            # Runs on the pool's result thread, which must not raise (the
+            # render would then wait forever): errors (e.g. of an encoder)
+            # are re-raised by the producer loop.
+            try:
+                file_path, statistics = result
+                if report is not None:
+                    report._record_frame(file_path, statistics)
+                if not keep_scripts:
+                    os.remove(file_path + ".pov")
+                if on_rendered is not None:
+                    on_rendered(file_path)
+                pbar.update()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                queue_slots.release()
+
+        def on_error(error):
+            errors.append(error)
+            queue_slots.release()
+
+        with Scene._render_pool(n_agents, engine) as p:
+            pending = []
+            for file_path in scripted_frames:
+                queue_slots.acquire()
+                if errors:
+                    break
+                pending.append(
+                    p.apply_async(
+                        _render_frame,
+                        (render, file_path),
+                        callback=on_frame_rendered,
+                        error_callback=on_error,
+                    )
+                )
+            for result in pending:
+                result.wait()
+        pbar.close()
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def _render_profile(profile, width, height):
+        """Scaled image size, `render_povray` settings and frame stride of a
+        render `profile` (see `RENDER_PROFILES`)."""
+        if profile is None:
+            profile = "final"
+        if isinstance(profile, str):
+            if profile not in RENDER_PROFILES:
+                raise ValueError(
+                    "render profile must be one of the following: "
+                    + ", ".join(RENDER_PROFILES)
+                )
+            profile = RENDER_PROFILES[profile]
+        unknown = set(profile) - set(RENDER_PROFILES["final"])
+        if unknown:
+            raise ValueError(
+                "unknown render profile settings: " + ", ".join(sorted(unknown))
+            )
+        settings = {**RENDER_PROFILES["final"], **profile}
+        scale = settings.pop("resolution_scale")
+        frame_stride = settings.pop("frame_stride")
+        if not isinstance(scale, Real) or scale <= 0:
+            raise ValueError("resolution_scale must be a positive number")
+        if not isinstance(frame_stride, int) or frame_stride < 1:
+            raise ValueError("frame_stride must be a positive integer")
+        width = max(1, round(width * scale))
+        height = max(1, round(height * scale))
+        return width, height, settings, frame_stride
+
+    @staticmethod
+    def _remote_settings(render, threads_per_agent=None):
+        """`render_povray` settings of the `render` partial for remote
+        workers, leaving their threads to the workers unless given."""
+        settings = dict(render.keywords)
+        # workers locate their own executable, and render tiles as jobs
+        del settings["executable"]
+        settings.pop("tile_processes", None)
+        if threads_per_agent is None:
+            del settings["pov_thread"]
+        else:
+            settings["pov_thread"] = threads_per_agent
+        return settings
+
+    @staticmethod
+    @contextmanager
+    def _render_pool(n_agents, engine=None):
+        """Pool of `n_agents` render processes, terminated on exit, or the
+        warm pool of `engine`, left running."""
+        if engine is not None:
+            yield engine.pool
+            return
+        with Pool(n_agents) as p:
+            yield p
+
+    @staticmethod
+    def _render_batch(
+        batch, render, n_agents, on_rendered=None, engine=None, report=None
+    ):
+        """Render every frame of `batch` with `render(file_path)`, on a pool
+        of `n_agents` processes if more than one (or on `engine`'s pool),
+        calling `on_rendered(file_path)` (if given) as each frame finishes
+        and recording its statistics in `report` (if given)."""
+        pbar = tqdm(total=len(batch), desc="Rendering")  # Progress Bar
+        if engine is not None or n_agents > 1:
+            with Scene._render_pool(n_agents, engine) as p:
+                func = partial(_render_frame, render)
+                rendered = p.imap_unordered(func, batch)
+                for filename, statistics in rendered:
+                    if report is not None:
+                        report._record_frame(filename, statistics)
+                    if on_rendered is not None:
+                        on_rendered(filename)
+                    pbar.update()
+        else:
+            for filename in batch:
+                statistics = render(filename)
+                if report is not None:
+                    report._record_frame(filename, statistics)
+                if on_rendered is not None:
+                    on_rendered(filename)
+                pbar.update()
+        pbar.close()
+
     def render_frames(
         self,
         output_images_directory,
@@ -278,56 +1057,164 @@ class Scene(Stage):
         WIDTH=1920,
         HEIGHT=1080,
         DISPLAY_FRAMES="Off",
+        scripting_workers: int = 1,
+        split_static: bool = True,
+        frame_cache=None,
+        render_processes: int = None,
+        threads_per_agent: int = None,
+        frustum_culling: bool = False,
+        lod_pixel_error: float = None,
+        coordinator=None,
+        tiles: int = 1,
+        profile=None,
+        engine=None,
+        report=None,
     ):
-        batch = []
+        """Render one image per camera for each of the given times.
 
-        # Colect povray scripts for each camera
-        for idx, camera in enumerate(self.cameras):
-            view_name = camera.name
-            output_path = os.path.join(output_images_directory, view_name)
-            os.makedirs(output_path, exist_ok=True)
-            light_ids = self._light_assign[idx] + self._light_assign[-1]
-
-            # create script for each given time
-            for frame_number, time in tqdm(enumerate(times), desc="Scripting"):
-                frame_script = [self.background.generate_script(time)]
-
-                # update and append camera
-                camera.generate_script(time)
-                frame_script.append(str(camera))
-
-                # update and append lights
-                for light_id in light_ids:  # Script Lightings
-                    self.lights[light_id].generate_script(time)
-                    frame_script.append(str(self.lights[light_id]))
-
-                # append scene objects
-                for scene_object in self.objects:
-                    scene_object.generate_script(time)
-                    frame_script.append(str(scene_object))
+        Parameters
+        ----------
+        output_images_directory : str
+            Directory of the output; every camera writes its .pov scripts
+            and .png images into a sub-directory named after it.
+        times : list
+            Times to render.
+        name : str
+            Prefix of the frame files, `<name>_<frame_number>`. [default="time"]
+        WIDTH, HEIGHT : int
+            Image size in pixels. [default=1920, 1080]
+        DISPLAY_FRAMES : str
+            POV-Ray's Display option. [default="Off"]
+        scripting_workers : int
+            Number of scripting processes. [default=1]
+        split_static : bool
+            Script time-invariant lights and objects, and the time-invariant
+            parts of the other objects (e.g. a deforming Mesh's faces), once
+            into shared include files. [default=True]
+        frame_cache : FrameCache or str or None
+            Cache (or cache directory) of rendered frames. [default=None]
+        render_processes, threads_per_agent : int or None
+            Number of concurrent POV-Ray processes and threads per process.
+            [default=None] If None, picked by `schedule_render` from the
+            CPUs available to this process.
+        frustum_culling : bool
+            Leave the time-dependent objects a camera does not see out of
+            its frames (see `Scene.Object.cullable`). [default=False]
+        lod_pixel_error : float or None
+            Script the time-dependent objects with levels of detail (e.g.
+            `Mesh.build_lod_levels`) at the coarsest level whose error
+            spans at most this many pixels. [default=None] If None, every
+            object is scripted at full detail.
+        coordinator : RenderCoordinator or None
+            Render the frames on the workers of this coordinator (see
+            `svt.rendering.distributed`) instead of on this machine, which
+            then only scripts them. [default=None] The output directory
+            must be on a filesystem shared with the workers.
+        tiles : int
+            Split every frame into this many tiles, rendered concurrently
+            (on separate workers with a `coordinator`) and stitched into
+            the frame, e.g. for large stills. [default=1]
+            `render_processes` then counts the POV-Ray processes of the
+            tiles.
+        profile : str or dict or None
+            Render profile, one of `RENDER_PROFILES` ("draft", "preview",
+            "final"), or a dict overriding some of the "final" profile's
+            settings. [default=None] If None, the "final" profile. The
+            image size is scaled by the profile's `resolution_scale` (the
+            cameras' framing is kept), and only every `frame_stride`-th
+            time is rendered.
+        engine : RenderEngine or None
+            Render on the warm process pool of this engine, with its
+            executable, processes and threads, instead of starting a pool
+            for this render. [default=None]
+        report : RenderReport or None
+            Record the scripting time and size of every object type and
+            frame, and the POV-Ray statistics of every rendered frame, in
+            this report. [default=None] Frames rendered by a `coordinator`
+            are recorded without POV-Ray statistics.
+        """
+        if not isinstance(tiles, int) or tiles < 1:
+            raise ValueError("tiles must be a positive integer")
+        WIDTH, HEIGHT, render_settings, frame_stride = self._render_profile(
+            profile, WIDTH, HEIGHT
+        )
+        times = list(times)[::frame_stride]
+        frame_cache = self._frame_cache(frame_cache)
+        if report is not None:
+            report._start_render()
 
-                pov_script = "\n".join(frame_script)
-                # Write .pov script file
-                file_path = os.path.join(
-                    output_path, "{0}_{1:04d}".format(name, frame_number)
+        # Colect povray scripts for each camera
+        jobs = self._frame_jobs(output_images_directory, times, name)
+        static_includes = None
+        object_includes = nullcontext()
+        if split_static and len(times) > 0:
+            static_includes = self._write_static_includes(
+                output_images_directory, name, times[0], report
+            )
+            object_includes = self._object_includes(
+                output_images_directory, name, times[0], report
+            )
+        repeats = []
+        with (
+            object_includes,
+            self._precomputed_values(times),
+            self._shared_scripts(),
+            self._frustum_culling(WIDTH, HEIGHT, frustum_culling),
+            self._level_of_detail(WIDTH, lod_pixel_error),
+            self._instrumented(report),
+        ):
+            batch = list(
+                self._skip_repeated_frames(
+                    self._iter_scripted_frames(
+                        jobs,
+                        scripting_workers,
+                        static_includes=static_includes,
+                        report=report,
+                    ),
+                    repeats,
                 )
-                with open(file_path + ".pov", "w+") as f:
-                    f.write(pov_script)
-                batch.append(file_path)
+            )
 
         # Process POVray
         # For each frames, a 'png' image file is generated in OUTPUT_IMAGE_DIR directory.
-        pbar = tqdm(total=len(batch), desc="Rendering")  # Progress Bar
-        for filename in batch:
-            render_povray(
-                filename,
-                width=WIDTH,
-                height=HEIGHT,
-                display=DISPLAY_FRAMES,
-                pov_thread=multiprocessing.cpu_count(),
-                transparency=self.background.transparent,
+        # Every tile is rendered by its own POV-Ray process
+        n_agents, pov_thread = schedule_render(
+            len(batch) * tiles, render_processes, threads_per_agent
+        )
+        frames = None
+        if engine is not None:
+            # the engine's pool renders one frame per process
+            n_agents, pov_thread = engine.processes, engine.pov_thread
+            frames = engine.processes
+        # frames, each rendering its tiles concurrently, share those CPUs
+        n_agents, tile_processes, pov_thread = schedule_tiles(
+            n_agents, pov_thread, tiles, frames
+        )
+        func = partial(
+            render_povray,
+            width=WIDTH,
+            height=HEIGHT,
+            display=DISPLAY_FRAMES,
+            pov_thread=pov_thread,
+            transparency=self.background.transparent,
+            cache=frame_cache,
+            tiles=tiles,
+            tile_processes=tile_processes,
+            executable=None if engine is None else engine.executable,
+            **render_settings,
+        )
+        if coordinator is not None:
+            coordinator.render(
+                batch,
+                self._remote_settings(func, threads_per_agent),
+                None if report is None else report._record_frame,
             )
-            pbar.update()
+        else:
+            self._render_batch(batch, func, n_agents, engine=engine, report=report)
+        self._copy_repeated_frames(repeats)
+        if report is not None:
+            report._record_repeats(repeats)
+            report._finish_render()
 
     def render_video(
         self,
@@ -339,88 +1226,369 @@ class Scene(Stage):
         height=1080,
         DISPLAY_FRAMES="Off",
         multiprocessing_flag: bool = False,
-        threads_per_agent: int = 4,
+        threads_per_agent: int = None,
         frames_per_second: int = 20,
+        scripting_workers: int = 1,
+        split_static: bool = True,
+        pipeline: bool = False,
+        max_queued_frames: int = None,
+        keep_scripts: bool = True,
+        frame_cache=None,
+        render_processes: int = None,
+        video_profile: str = "prores4444",
+        frustum_culling: bool = False,
+        lod_pixel_error: float = None,
+        coordinator=None,
+        profile=None,
+        engine=None,
+        report=None,
     ):
+        """Render the scene from `start_time` to `final_time` and assemble
+        every camera's frames into a `<rendering_name>_<camera name>` video.
 
-        batch = []
+        Parameters
+        ----------
+        output_images_directory : str
+            Directory of the output; every camera writes its .pov scripts
+            and .png frames into a sub-directory named after it.
+        rendering_name : str
+            Prefix of the video files.
+        final_time, start_time : float
+            Time span to render. [default start_time=0]
+        width, height : int
+            Image size in pixels. [default=1920, 1080]
+        DISPLAY_FRAMES : str
+            POV-Ray's Display option. [default="Off"]
+        multiprocessing_flag : bool
+            Render several frames concurrently. [default=False]
+        threads_per_agent : int or None
+            Threads of each POV-Ray process. [default=None]
+            If None, picked by `schedule_render`.
+        frames_per_second : int or float or Fraction
+            Frame rate of the videos. [default=20]
+            Non-integer rates such as 29.97 are passed to ffmpeg as the
+            closest fraction with a denominator of at most 1001000.
+        scripting_workers : int
+            Number of scripting processes. [default=1]
+        split_static : bool
+            Script time-invariant lights and objects, and the time-invariant
+            parts of the other objects (e.g. a deforming Mesh's faces), once
+            into shared include files. [default=True]
+        pipeline : bool
+            Render frames while later frames are still being scripted.
+            [default=False]
+        max_queued_frames : int or None
+            With `pipeline`, bound of the scripted-but-not-rendered frames.
+            [default=None] If None, twice the number of render processes.
+        keep_scripts : bool
+            Keep the .pov scripts once rendered. [default=True]
+        frame_cache : FrameCache or str or None
+            Cache (or cache directory) of rendered frames. [default=None]
+        render_processes : int or None
+            With `multiprocessing_flag`, number of concurrent POV-Ray
+            processes. [default=None] If None, picked by `schedule_render`.
+        video_profile : str or None
+            Codec profile of the videos, one of `VIDEO_PROFILES`
+            ("prores4444" with alpha, "h264" previews, "vp9" with alpha).
+            [default="prores4444"] If None, only the frames are rendered.
+            Frames are streamed to one ffmpeg process per camera as they
+            are rendered, so the videos are done right after the last frame.
+        frustum_culling : bool
+            Leave the time-dependent objects a camera does not see out of
+            its frames (see `Scene.Object.cullable`). [default=False]
+        lod_pixel_error : float or None
+            Script the time-dependent objects with levels of detail (e.g.
+            `Mesh.build_lod_levels`) at the coarsest level whose error
+            spans at most this many pixels. [default=None] If None, every
+            object is scripted at full detail.
+        coordinator : RenderCoordinator or None
+            Render the frames on the workers of this coordinator (see
+            `svt.rendering.distributed`) instead of on this machine, which
+            then only scripts them. [default=None] The output directory
+            must be on a filesystem shared with the workers.
+        profile : str or dict or None
+            Render profile, one of `RENDER_PROFILES` ("draft", "preview",
+            "final"), or a dict overriding some of the "final" profile's
+            settings. [default=None] If None, the "final" profile. The
+            image size is scaled by the profile's `resolution_scale` (the
+            cameras' framing is kept), and only every `frame_stride`-th
+            frame is rendered (the videos keep their duration at a lower
+            frame rate).
+        engine : RenderEngine or None
+            Render on the warm process pool of this engine, with its
+            executable, processes and threads, instead of starting a pool
+            for this render. [default=None]
+        report : RenderReport or None
+            Record the scripting time and size of every object type and
+            frame, and the POV-Ray statistics of every rendered frame, in
+            this report. [default=None] Frames rendered by a `coordinator`
+            are recorded without POV-Ray statistics.
+        """
+        width, height, render_settings, frame_stride = self._render_profile(
+            profile, width, height
+        )
+        frame_cache = self._frame_cache(frame_cache)
+        if report is not None:
+            report._start_render()
         total_frames = int((final_time - start_time) * frames_per_second)
+        times = [
+            start_time + frame_number / frames_per_second
+            for frame_number in range(0, total_frames, frame_stride)
+        ]
+        total_frames = len(times)
 
         # Colect povray scripts for each camera
-        for idx, camera in enumerate(self.cameras):
-            view_name = camera.name
-            output_path = os.path.join(output_images_directory, view_name)
-            os.makedirs(output_path, exist_ok=True)
-            light_ids = self._light_assign[idx] + self._light_assign[-1]
-
-            # create script for each frame
-            for frame_number in tqdm(range(total_frames), desc="Scripting"):
-                current_time = start_time + frame_number / frames_per_second
-                frame_script = [self.background.generate_script(current_time)]
-
-                # update and append camera
-                camera.generate_script(current_time)
-                frame_script.append(str(camera))
-
-                # update and append lights
-                for light_id in light_ids:  # Script Lightings
-                    self.lights[light_id].generate_script(current_time)
-                    frame_script.append(str(self.lights[light_id]))
-
-                # append scene objects
-                for scene_object in self.objects:
-                    scene_object.generate_script(current_time)
-                    frame_script.append(str(scene_object))
-
-                pov_script = "\n".join(frame_script)
-                # Write .pov script file
-                file_path = os.path.join(
-                    output_path, "frame_{:04d}".format(frame_number)
+        jobs = self._frame_jobs(output_images_directory, times, "frame")
+        static_includes = None
+        object_includes = nullcontext()
+        if split_static and total_frames > 0:
+            static_includes = self._write_static_includes(
+                output_images_directory, "frame", times[0], report
+            )
+            object_includes = self._object_includes(
+                output_images_directory, "frame", times[0], report
+            )
+
+        # Split the CPUs between parallel renders (and, when pipelined,
+        # the scripting workers running alongside them).
+        cpus = available_cpus()
+        if pipeline and scripting_workers > 1:
+            cpus = max(1, cpus - scripting_workers)
+        if not multiprocessing_flag:
+            render_processes = 1
+        n_agents, pov_thread = schedule_render(
+            len(jobs), render_processes, threads_per_agent, cpus
+        )
+        if engine is not None:
+            n_agents, pov_thread = engine.processes, engine.pov_thread
+        if max_queued_frames is None:
+            max_queued_frames = 2 * n_agents
+        func = partial(
+            render_povray,
+            width=width,
+            height=height,
+            display=DISPLAY_FRAMES,
+            pov_thread=pov_thread,
+            transparency=self.background.transparent,
+            cache=frame_cache,
+            executable=None if engine is None else engine.executable,
+            **render_settings,
+        )
+
+        # Stream frames into one encoder per camera as they are rendered
+        encoders = {}
+        if video_profile is not None:
+            for camera_id, camera in enumerate(self.cameras):
+                encoders[camera_id] = VideoEncoder(
+                    rendering_name + "_" + camera.name,
+                    Fraction(frames_per_second).limit_denominator(1001000)
+                    / frame_stride,
+                    video_profile,
                 )
-                with open(file_path + ".pov", "w+") as f:
-                    f.write(pov_script)
-                batch.append(file_path)
+        # jobs are ordered time by time, one per camera
+        frame_numbers = {
+            file_path: (camera_id, job_index // len(self.cameras))
+            for job_index, (camera_id, _, file_path) in enumerate(jobs)
+        }
 
-        # Process POVray
-        # For each frames, a 'png' image file is generated in OUTPUT_IMAGE_DIR directory.
-        pbar = tqdm(total=len(batch), desc="Rendering")  # Progress Bar
-        if multiprocessing_flag:
-            n_agents = multiprocessing.cpu_count() // 2  # number of parallel rendering.
-            func = partial(
-                render_povray,
-                width=width,
-                height=height,
-                display=DISPLAY_FRAMES,
-                pov_thread=threads_per_agent,
-                transparency=self.background.transparent,
-            )
-            with Pool(n_agents) as p:
-                for message in p.imap_unordered(func, batch):
-                    # (TODO) POVray error within child process could be an issue
-                    pbar.update()
-        else:
-            for filename in batch:
-                render_povray(
-                    filename,
-                    width=width,
-                    height=height,
-                    display=DISPLAY_FRAMES,
-                    pov_thread=multiprocessing.cpu_count(),
-                    transparency=self.background.transparent,
+        def encode_frame(file_path, image_path=None):
+            camera_id, frame_number = frame_numbers[file_path]
+            if camera_id in encoders:
+                encoders[camera_id].add_frame(
+                    frame_number, (image_path or file_path) + ".png"
                 )
-                pbar.update()
 
-        # Create Videos using ffmpeg
-        for camera in self.cameras:
-            view_name = camera.name
-            imageset_path = os.path.join(output_images_directory, view_name)
-            filename = rendering_name + "_" + view_name + ".mov"
+        def encode_repeat(rendered_file_path, repeated_file_path):
+            encode_frame(repeated_file_path, rendered_file_path)
 
-            os.system(
-                f"ffmpeg -y -r {frames_per_second} -i {imageset_path}/frame_%04d.png -c:v prores_ks -profile:v 4444 -pix_fmt yuva444p10le {filename}"
-            )
+        repeats = []
+        try:
+            with (
+                object_includes,
+                self._precomputed_values(times),
+                self._shared_scripts(),
+                self._frustum_culling(width, height, frustum_culling),
+                self._level_of_detail(width, lod_pixel_error),
+                self._instrumented(report),
+            ):
+                if coordinator is not None:
+                    # Remote workers render each frame as soon as it is scripted
+                    scripted_frames = self._skip_repeated_frames(
+                        self._iter_scripted_frames(
+                            jobs,
+                            scripting_workers,
+                            chunk_size=1,
+                            static_includes=static_includes,
+                            report=report,
+                        ),
+                        repeats,
+                        encode_repeat,
+                    )
+
+                    def on_rendered(file_path):
+                        if report is not None:
+                            report._record_frame(file_path)
+                        if not keep_scripts:
+                            os.remove(file_path + ".pov")
+                        encode_frame(file_path)
+
+                    coordinator.render(
+                        scripted_frames,
+                        self._remote_settings(func, threads_per_agent),
+                        on_rendered,
+                    )
+                elif pipeline:
+                    # Render each frame as soon as it is scripted
+                    scripted_frames = self._skip_repeated_frames(
+                        self._iter_scripted_frames(
+                            jobs,
+                            scripting_workers,
+                            chunk_size=1,
+                            static_includes=static_includes,
+                            report=report,
+                        ),
+                        repeats,
+                        encode_repeat,
+                    )
+                    self._render_pipelined(
+                        scripted_frames,
+                        func,
+                        n_agents,
+                        max_queued_frames,
+                        keep_scripts,
+                        encode_frame,
+                        engine,
+                        report,
+                    )
+                else:
+                    batch = list(
+                        self._skip_repeated_frames(
+                            self._iter_scripted_frames(
+                                jobs,
+                                scripting_workers,
+                                static_includes=static_includes,
+                                report=report,
+                            ),
+                            repeats,
+                            encode_repeat,
+                        )
+                    )
+
+                    # Process POVray
+                    # For each frames, a 'png' image file is generated in OUTPUT_IMAGE_DIR directory.
+                    self._render_batch(
+                        batch, func, n_agents, encode_frame, engine, report
+                    )
+                    if not keep_scripts:
+                        for filename in batch:
+                            os.remove(filename + ".pov")
+            self._copy_repeated_frames(repeats, keep_scripts)
+            if report is not None:
+                report._record_repeats(repeats)
+        except BaseException:
+            for encoder in encoders.values():
+                encoder.abort()
+            raise
+
+        # Finish the videos
+        for encoder in encoders.values():
+            encoder.close()
+        if report is not None:
+            report._finish_render()
 
     def render_interactive(
         self,
     ):
         return NotImplementedError
+
+
+class _BakedValue:
+    """Placeholder of a baked TimeCallable in a baked scene's skeleton,
+    naming its array file (see `Scene.export`)."""
+
+    def __init__(self, array_file):
+        self.array_file = array_file
+
+
+def _bake(value, times, path):
+    """Evaluate the TimeCallable `value` at `times` into the `.npy` file
+    `path`, a chunk of frames at a time, and return its shape and dtype.
+
+    Index values are stored as integers and every other value as floats,
+    whatever the callable returns at the first time.
+    """
+    first = value.evaluate_many(times[:1])
+    dtype = np.int64 if isinstance(value, (TimeIndexN, TimeIndexMN)) else np.float64
+    shape = (len(times),) + first.shape[1:]
+    chunk = max(1, _BAKE_CHUNK_BYTES // max(1, first[0].size * 8))
+    array = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    for start in range(0, len(times), chunk):
+        values = value.evaluate_many(times[start : start + chunk])
+        if values.shape[1:] != shape[1:]:
+            raise ValueError(
+                f"can not bake a value whose shape changes over time "
+                f"(from {shape[1:]} to {values.shape[1:]})"
+            )
+        array[start : start + chunk] = values
+    array.flush()
+    del array
+    return list(shape), np.dtype(dtype)
+
+
+class _ScriptMemo:
+    """Least-recently-used store of object scripts keyed by `(key, time)`,
+    holding at most `max_bytes` characters of scripts.
+
+    Object scripts do not depend on the camera, so the views of a frame
+    script each object once and reuse it. Keys are positions in the scene
+    (e.g. `("object", 3)`) rather than ids, so a memo shipped to a
+    scripting worker stays valid there.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._scripts = OrderedDict()
+        self._size = 0
+
+    def script(self, key, scene_object, time, statistics=None):
+        """Script of `scene_object` at `time`, generated on a miss (and
+        recorded in `statistics`, a `_ScriptStatistics`, if given)."""
+        script = self._scripts.get((key, time))
+        if script is not None:
+            self._scripts.move_to_end((key, time))
+            return script
+        start = perf_counter()
+        scene_object.generate_script(time)
+        script = str(scene_object)
+        if statistics is not None:
+            statistics.record_object(
+                type(scene_object).__name__, perf_counter() - start, len(script)
+            )
+        if len(script) <= self.max_bytes:
+            self._scripts[(key, time)] = script
+            self._size += len(script)
+            while self._size > self.max_bytes:
+                _, evicted = self._scripts.popitem(last=False)
+                self._size -= len(evicted)
+        return script
+
+
+# Scene shipped to each scripting worker by `_init_scripting_worker`.
+_worker_scene = None
+
+
+def _init_scripting_worker(scene_bytes):
+    """Pool initializer: unpickle the scene once per scripting process."""
+    global _worker_scene
+    _worker_scene = dill.loads(scene_bytes)
+
+
+def _script_chunk(jobs, static_includes=None):
+    """Pool task: write the .pov scripts of a chunk of frame jobs, see
+    `Scene._write_frame_scripts`."""
+    return _worker_scene._write_frame_scripts(jobs, static_includes)
+
+
+def _render_frame(render, file_path):
+    """Pool task: render one frame and return its file path and statistics."""
+    return file_path, render(file_path)
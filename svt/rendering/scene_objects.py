@@ -1,4 +1,7 @@
+import re
 import numpy as np
+from functools import partial
+from numbers import Real
 from svt.rendering.scene import Scene
 from svt.rendering.utils import (
     TimeScalar,
@@ -6,17 +9,266 @@ from svt.rendering.utils import (
     TimeVecMN,
     TimeIndexN,
     TimeIndexMN,
+    TimeArray,
     _bool_property,
+    _wrapped_property,
+    _format_rows,
+    _pov_include,
+    _time_callables,
     sf,
+    sf_array,
 )
 
 
+def _bounding_sphere(points, radii=0):
+    """`(center, radius)` of a sphere enclosing the spheres of (3, ...)
+    `points` with `radii` (broadcast against the points), centered on
+    their bounding box."""
+    points = np.asarray(points, dtype=float).reshape(3, -1)
+    if points.shape[-1] == 0:
+        return None
+    radii = np.broadcast_to(
+        np.asarray(radii, dtype=float).reshape(-1), points.shape[-1:]
+    )
+    center = 0.5 * (points.min(axis=1) + points.max(axis=1))
+    distances = np.linalg.norm(points - center[:, np.newaxis], axis=0)
+    return center, float(np.max(distances + radii))
+
+
+def _douglas_peucker(points, position_tolerance, radius_tolerance):
+    """Douglas–Peucker simplification of the polyline of (4, n) x, y, z,
+    radius `points`: a boolean mask of the points to keep, such that every
+    dropped point lies within `position_tolerance` of the simplified
+    polyline, and its radius within `radius_tolerance` of the radius
+    interpolated there.
+
+    Every segment of the current simplification is split at its worst point
+    in one vectorized pass, so the number of NumPy passes grows with the
+    depth of the recursion rather than the number of points.
+    """
+    n_points = points.shape[-1]
+    keep = np.zeros(n_points, dtype=bool)
+    keep[[0, -1]] = True
+    nodes = np.arange(n_points)
+    while True:
+        kept = np.flatnonzero(keep)
+        segment = np.minimum(
+            np.searchsorted(kept, nodes, side="right") - 1, len(kept) - 2
+        )
+        start = points[:, kept[segment]]
+        chord = points[:, kept[segment + 1]] - start
+        offset = points - start
+        length2 = np.sum(chord[:3] ** 2, axis=0)
+        s = np.clip(
+            np.sum(offset[:3] * chord[:3], axis=0) / np.where(length2 > 0, length2, 1),
+            0,
+            1,
+        )
+        position_error = np.linalg.norm(offset[:3] - s * chord[:3], axis=0)
+        radius_error = np.abs(offset[3] - s * chord[3])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            error = np.maximum(
+                np.where(position_error > 0, position_error / position_tolerance, 0),
+                np.where(radius_error > 0, radius_error / radius_tolerance, 0),
+            )
+        error[keep] = 0
+        # worst point of every segment: first in (segment, -error) order
+        order = np.lexsort((-error, segment))
+        first = order[np.r_[True, segment[order][1:] != segment[order][:-1]]]
+        split = first[error[first] > 1]
+        if len(split) == 0:
+            return keep
+        keep[split] = True
+
+
+def _sweep_centerline(points, interpolation_method, axial_resolution):
+    """(4, m) x, y, z and radius along the centerline of a sphere_sweep of
+    (4, n) control `points`, sampled `axial_resolution` times per spline
+    segment.
+
+    Linear splines are sampled at their control points only, their
+    segments being straight. Cubic splines are Catmull-Rom splines and
+    b-splines uniform cubic B-splines, both spanning the n - 3 segments
+    between their first and last pair of control points, as POV-Ray's
+    (splines of fewer than 4 points are sampled as linear splines).
+    """
+    if interpolation_method == "linear_spline" or points.shape[1] < 4:
+        return points
+    u = np.linspace(0, 1, axial_resolution, endpoint=False)
+    u2 = u * u
+    u3 = u2 * u
+    if interpolation_method == "cubic_spline":
+        basis = 0.5 * np.stack(
+            [-u3 + 2 * u2 - u, 3 * u3 - 5 * u2 + 2, -3 * u3 + 4 * u2 + u, u3 - u2]
+        )
+        end = points[:, -2]
+    else:
+        basis = (
+            np.stack(
+                [(1 - u) ** 3, 3 * u3 - 6 * u2 + 4, -3 * u3 + 3 * u2 + 3 * u + 1, u3]
+            )
+            / 6
+        )
+        end = points[:, -4:] @ np.array([0, 1, 4, 1]) / 6
+    # (4, n - 3 segments, 4 control points) windows of the control points
+    windows = np.lib.stride_tricks.sliding_window_view(points, 4, axis=1)
+    samples = np.einsum("csk,ku->csu", windows, basis).reshape(4, -1)
+    return np.hstack([samples, end[:, np.newaxis]])
+
+
+def _tube_mesh(centerline, radial_resolution):
+    """Triangle tube around a (4, m) x, y, z and radius `centerline`, closed
+    by hemispherical caps like a sphere_sweep.
+
+    Rings of `radial_resolution` vertices are oriented by parallel-transport
+    (rotation-minimizing) frames, so the tube does not twist. Each node's
+    frame is transported from its predecessor's by the minimal rotation
+    between their tangents; these twists are measured against an arbitrary
+    per-node reference normal in one vectorized pass and accumulated.
+
+    Returns
+    -------
+    vertices, normals : numpy.ndarray
+        (3, n_vertices) vertex positions and unit normals.
+    faces : numpy.ndarray
+        (3, n_faces) vertex indices of the triangles.
+    """
+    centers = np.asarray(centerline[:3], dtype=float)
+    radii = np.asarray(centerline[3], dtype=float)
+    steps = np.linalg.norm(np.diff(centers, axis=1), axis=0)
+    # coincident nodes would have no tangent
+    distinct = np.r_[True, steps > 0]
+    centers, radii = centers[:, distinct], radii[distinct]
+    n_nodes = centers.shape[1]
+    if n_nodes < 2:
+        tangents = np.array([[0.0], [0.0], [1.0]])
+        slopes = np.zeros(1)
+    else:
+        tangents = np.gradient(centers, axis=1)
+        tangents /= np.linalg.norm(tangents, axis=0)
+        arc_length = np.r_[0, np.cumsum(steps[steps > 0])]
+        slopes = np.gradient(radii, arc_length)
+
+    # reference normals: each tangent crossed with its least aligned axis
+    axes = np.eye(3)[:, np.argmin(np.abs(tangents), axis=0)]
+    references = np.cross(tangents, axes, axis=0)
+    references /= np.linalg.norm(references, axis=0)
+    # transport of each reference normal to the next node (Rodrigues'
+    # rotation taking the tangent to the next one), and its twist there
+    a, b = tangents[:, :-1], tangents[:, 1:]
+    axis = np.cross(a, b, axis=0)
+    cosine = np.sum(a * b, axis=0)
+    v = references[:, :-1]
+    transported = (
+        v * cosine
+        + np.cross(axis, v, axis=0)
+        + axis * np.sum(axis * v, axis=0) / np.maximum(1 + cosine, 1e-12)
+    )
+    twist = np.arctan2(
+        np.sum(np.cross(references[:, 1:], transported, axis=0) * b, axis=0),
+        np.sum(references[:, 1:] * transported, axis=0),
+    )
+    angle = np.r_[0, np.cumsum(twist)]
+    binormals = np.cross(tangents, references, axis=0)
+    normals = references * np.cos(angle) + binormals * np.sin(angle)
+    binormals = np.cross(tangents, normals, axis=0)
+
+    # rings: the start cap (pole excluded), the tube, the end cap
+    theta = 2 * np.pi * np.arange(radial_resolution) / radial_resolution
+    directions = normals[:, :, np.newaxis] * np.cos(theta) + binormals[
+        :, :, np.newaxis
+    ] * np.sin(theta)
+    n_cap_rings = max(radial_resolution // 4, 1)
+    latitudes = 0.5 * np.pi * np.arange(1, n_cap_rings) / n_cap_rings
+
+    def cap(node, sign, latitudes):
+        # unit sphere directions of the cap's rings around `node`
+        return (
+            directions[:, node, np.newaxis] * np.cos(latitudes)[:, np.newaxis]
+            + sign
+            * tangents[:, node, np.newaxis, np.newaxis]
+            * np.sin(latitudes)[:, np.newaxis]
+        )
+
+    # on the caps, vertices lie on the end spheres along their normals
+    start_cap = cap(0, -1, latitudes[::-1])
+    end_cap = cap(-1, 1, latitudes)
+    ring_directions = np.concatenate([start_cap, directions, end_cap], axis=1)
+    # the tube's normals lean against the tangent where the radius changes
+    tube_normals = directions - slopes[:, np.newaxis] * tangents[:, :, np.newaxis]
+    tube_normals /= np.linalg.norm(tube_normals, axis=0)
+    ring_normals = np.concatenate([start_cap, tube_normals, end_cap], axis=1)
+    n_cap = len(latitudes)
+    ring_centers = np.hstack(
+        [
+            np.repeat(centers[:, :1], n_cap, 1),
+            centers,
+            np.repeat(centers[:, -1:], n_cap, 1),
+        ]
+    )
+    ring_radii = np.r_[np.repeat(radii[0], n_cap), radii, np.repeat(radii[-1], n_cap)]
+    ring_vertices = (
+        ring_centers[:, :, np.newaxis] + ring_radii[:, np.newaxis] * ring_directions
+    )
+    n_rings = ring_normals.shape[1]
+    poles = centers[:, [0, -1]] + radii[[0, -1]] * tangents[:, [0, -1]] * [-1, 1]
+    vertices = np.hstack([ring_vertices.reshape(3, -1), poles])
+    vertex_normals = np.hstack(
+        [ring_normals.reshape(3, -1), tangents[:, [0, -1]] * [-1, 1]]
+    )
+
+    # two triangles per quad between consecutive rings, and a fan per pole,
+    # all wound counterclockwise seen from outside
+    ring = np.arange(n_rings - 1)[:, np.newaxis] * radial_resolution
+    k = np.arange(radial_resolution)
+    k_next = (k + 1) % radial_resolution
+    v00, v01 = ring + k, ring + k_next
+    v10, v11 = v00 + radial_resolution, v01 + radial_resolution
+    start_pole, end_pole = n_rings * radial_resolution + np.arange(2)
+    last_ring = (n_rings - 1) * radial_resolution
+    faces = np.hstack(
+        [
+            np.stack([v00, v11, v10]).reshape(3, -1),
+            np.stack([v00, v01, v11]).reshape(3, -1),
+            np.stack([np.full_like(k, start_pole), k_next, k]),
+            np.stack([np.full_like(k, end_pole), last_ring + k, last_ring + k_next]),
+        ]
+    )
+    return vertices, vertex_normals, faces
+
+
 class SphereSweep(Scene.Object):
     """A tube swept along a polyline of (position, radius) control points.
 
     http://www.povray.org/documentation/view/3.7.0/282/
+
+    Attributes
+    ----------
+    render_mode : str
+        One of `RENDER_MODES`. [default="sphere_sweep"]
+        "sphere_sweep" scripts the exact POV-Ray sphere_sweep, "mesh" a
+        mesh2 triangle tube with smooth normals (see `_tube_mesh`), which
+        POV-Ray intersects many times faster, spline sweeps especially.
+        Every SphereSweep of a scene can be switched at once with
+        `Scene.set_render_mode`.
+    radial_resolution : int
+        With the "mesh" render mode, vertices around the tube. [default=16]
+    axial_resolution : int
+        With the "mesh" render mode, rings along each segment of a b_spline
+        or cubic_spline sweep (linear segments are straight and have no
+        ring between their control points). [default=4]
     """
 
+    RENDER_MODES = ("sphere_sweep", "mesh")
+    static_when_constant = True
+
+    # Defaults of sweeps pickled by older versions (see `Scene.load`)
+    _render_mode = "sphere_sweep"
+    _radial_resolution = 16
+    _axial_resolution = 4
+    _simplify_tolerance = None
+    removed_points = 0
+
     def __init__(self, name, position, radius):
         super().__init__()
         self.name = name
@@ -25,6 +277,12 @@ class SphereSweep(Scene.Object):
         self.radius = TimeVecN(radius, n)
         self.color = TimeVecN([0.45, 0.39, 1])
         self.interpolation_method = "linear_spline"
+        self.render_mode = "sphere_sweep"
+        self.radial_resolution = 16
+        self.axial_resolution = 4
+        self.simplify_tolerance = None
+        # control points dropped by the simplification of the last script
+        self.removed_points = 0
 
     @property
     def interpolation_method(self):
@@ -41,14 +299,162 @@ class SphereSweep(Scene.Object):
             )
         self._interpolation_method = value
 
+    @property
+    def render_mode(self):
+        return self._render_mode
+
+    @render_mode.setter
+    def render_mode(self, value):
+        if not isinstance(value, str):
+            raise TypeError("render_mode must be a string")
+        if value not in self.RENDER_MODES:
+            raise ValueError(
+                "render mode must be one of the following: "
+                + ", ".join(self.RENDER_MODES)
+            )
+        self._render_mode = value
+
+    @property
+    def radial_resolution(self):
+        return self._radial_resolution
+
+    @radial_resolution.setter
+    def radial_resolution(self, value):
+        if not isinstance(value, int) or value < 3:
+            raise ValueError("radial_resolution must be an integer of at least 3")
+        self._radial_resolution = value
+
+    @property
+    def axial_resolution(self):
+        return self._axial_resolution
+
+    @axial_resolution.setter
+    def axial_resolution(self, value):
+        if not isinstance(value, int) or value < 1:
+            raise ValueError("axial_resolution must be a positive integer")
+        self._axial_resolution = value
+
+    @property
+    def simplify_tolerance(self):
+        """Tolerance of the control-point simplification of every frame, as
+        a `(position, radius)` pair (a number applies to both), or None to
+        script every control point.
+
+        Points are dropped with `_douglas_peucker` while every dropped
+        point stays within the position tolerance of the simplified
+        polyline and its radius within the radius tolerance. The number of
+        dropped points of the last frame is kept in `removed_points` (of the
+        process that scripted it, when scripting workers are used).
+        """
+        return self._simplify_tolerance
+
+    @simplify_tolerance.setter
+    def simplify_tolerance(self, value):
+        if value is not None:
+            if isinstance(value, Real):
+                value = (value, value)
+            if (
+                not isinstance(value, (list, tuple))
+                or len(value) != 2
+                or not all(isinstance(v, Real) and v >= 0 for v in value)
+            ):
+                raise ValueError(
+                    "simplify_tolerance must be None, a non-negative number or a "
+                    "(position, radius) pair of non-negative numbers"
+                )
+            value = tuple(value)
+        self._simplify_tolerance = value
+
+    @simplify_tolerance.deleter
+    def simplify_tolerance(self):
+        self._simplify_tolerance = None
+
+    def bounding_sphere(self, time):
+        # cubic splines overshoot their control points
+        if self.interpolation_method == "cubic_spline":
+            return None
+        return _bounding_sphere(self.position(time), self.radius(time))
+
+    def lod_level(self, time, max_error):
+        """Level k keeps every 2**k-th control point (and the last one); the
+        coarsest level whose dropped points, in position and radius, lie
+        within `max_error` of the thinned linear polyline is used. Levels
+        apply to the control points left by `simplify_tolerance`."""
+        points, _ = self._simplified(self._control_points(time))
+        n_points = points.shape[-1]
+        minimum_points = self._minimum_points()
+        nodes = np.arange(n_points)
+        level = 0
+        # beyond a stride of n_points - 1, only the end points are kept
+        while 2**level < n_points - 1:
+            kept = self._lod_indices(n_points, level + 1)
+            if len(kept) < minimum_points:
+                break
+            thinned = np.stack(
+                [np.interp(nodes, kept, coordinate[kept]) for coordinate in points]
+            )
+            deviation = np.linalg.norm(points[:3] - thinned[:3], axis=0)
+            if np.max(deviation + np.abs(points[3] - thinned[3])) > max_error:
+                break
+            level += 1
+        return level
+
+    @staticmethod
+    def _lod_indices(n_points, level):
+        """Control points kept at level of detail `level`."""
+        kept = np.arange(0, n_points, 2**level)
+        if kept[-1] != n_points - 1:
+            kept = np.append(kept, n_points - 1)
+        return kept
+
+    def _minimum_points(self):
+        """Fewest control points POV-Ray accepts for the interpolation."""
+        return 2 if self.interpolation_method == "linear_spline" else 4
+
+    def _simplified(self, control_points):
+        """`control_points` kept by the `simplify_tolerance` simplification,
+        and the number of dropped points."""
+        if self.simplify_tolerance is None or control_points.shape[-1] <= 2:
+            return control_points, 0
+        keep = _douglas_peucker(control_points.astype(float), *self.simplify_tolerance)
+        minimum_points = self._minimum_points()
+        if np.count_nonzero(keep) < minimum_points:
+            n_points = control_points.shape[-1]
+            spread = np.linspace(0, n_points - 1, minimum_points).round()
+            keep[spread.astype(int)] = True
+        return control_points[:, keep], int(np.count_nonzero(~keep))
+
+    def _control_points(self, time):
+        """(4, n) x, y, z and radius of every control point at `time`."""
+        return np.vstack(
+            [
+                np.asarray(self.position(time), dtype=float),
+                np.reshape(self.radius(time), (1, -1)),
+            ]
+        )
+
     def generate_script(self, time):
         x = self.position(time)
         r = self.radius(time)
-        num_element = x.shape[1]
-        rows = [
-            f",{self._fmt_vec(x[:, i], self.precision)},{sf(r[i], self.precision)}"
-            for i in range(num_element)
-        ]
+        control_points = np.vstack([x, np.reshape(r, (1, -1))])
+        control_points, self.removed_points = self._simplified(control_points)
+        level = self._lod
+        n_points = control_points.shape[-1]
+        # never thin below the points the interpolation needs
+        minimum_points = min(n_points, self._minimum_points())
+        while level and len(self._lod_indices(n_points, level)) < minimum_points:
+            level -= 1
+        if level:
+            control_points = control_points[:, self._lod_indices(n_points, level)]
+        if self.render_mode == "mesh":
+            self.str = self._mesh_script(control_points, time)
+            return
+        num_element = control_points.shape[1]
+        # One vectorized rounding/formatting pass over every control point;
+        # rows are joined with the indentation `_primitive_script` adds.
+        control_points = sf_array(control_points, self.precision)
+        rows = _format_rows(",<%r,%r,%r>,%r", control_points, separator="\n    ")
+        rows = [rows] if rows else []
         self.str = self._primitive_script(
             "sphere_sweep",
             f"{self.interpolation_method} {num_element}",
@@ -56,6 +462,31 @@ class SphereSweep(Scene.Object):
             time,
         )
 
+    def _mesh_script(self, control_points, time):
+        """mesh2 script of the tessellated tube of (4, n) `control_points`,
+        formatted as `Mesh`'s."""
+        centerline = _sweep_centerline(
+            np.asarray(control_points, dtype=float),
+            self.interpolation_method,
+            self.axial_resolution,
+        )
+        vertices, normals, faces = _tube_mesh(centerline, self.radial_resolution)
+        n_vertices = vertices.shape[-1]
+        blocks = [
+            self._pov_block(
+                "vertex_vectors",
+                n_vertices,
+                self._fmt_float_rows(vertices, self.precision),
+            ),
+            self._pov_block(
+                "normal_vectors",
+                n_vertices,
+                self._fmt_float_rows(normals, self.precision),
+            ),
+            self._pov_block("face_indices", faces.shape[-1], self._fmt_int_rows(faces)),
+        ]
+        return self._primitive_script("mesh2", None, blocks, time)
+
 
 class Sphere(Scene.Object):
     """A single sphere primitive.
@@ -63,6 +494,8 @@ class Sphere(Scene.Object):
     http://www.povray.org/documentation/view/3.7.0/283/
     """
 
+    static_when_constant = True
+
     def __init__(self, name, position, radius):
         super().__init__()
         self.name = name
@@ -70,6 +503,9 @@ class Sphere(Scene.Object):
         self.radius = TimeScalar(radius)
         self.color = TimeVecN([1, 0, 0])
 
+    def bounding_sphere(self, time):
+        return np.asarray(self.position(time), dtype=float), self.radius(time)
+
     def generate_script(self, time):
         x = self.position(time)
         r = self.radius(time)
@@ -77,12 +513,259 @@ class Sphere(Scene.Object):
         self.str = self._primitive_script("sphere", None, [row], time)
 
 
+class _PaletteObject(Scene.Object):
+    """Base of the array-backed collections (SphereCloud, RodBundle), whose
+    items either share the object's texture, or pick one of the `palette`
+    colors through `palette_indices`. Each palette texture is `#declare`d
+    once per frame and referenced by name from the items.
+
+    Attributes
+    ----------
+    palette : TimeVecMN
+        (4, K) rgbt palette colors. [default=[[1], [0], [0], [0]]]
+    palette_indices : TimeIndexN or None
+        Index of each item's `palette` color. [default=None]
+        If None, every item uses the object's `color`/`transmit`.
+    """
+
+    def __init__(self, name, n_items, palette_indices=None):
+        super().__init__()
+        self.name = name
+        self.n_items = n_items
+        self.palette = np.array([[1, 0, 0, 0]]).T
+        self.palette_indices = palette_indices
+
+    palette = _wrapped_property(
+        "palette", partial(TimeVecMN, m=4), np.array([[1, 0, 0, 0]]).T
+    )
+
+    @property
+    def palette_indices(self):
+        return self._palette_indices
+
+    @palette_indices.setter
+    def palette_indices(self, value):
+        if value is None:
+            self._palette_indices = value
+        else:
+            self._palette_indices = TimeIndexN(value, n=self.n_items)
+
+    @palette_indices.deleter
+    def palette_indices(self):
+        self._palette_indices = None
+
+    def _palette_declarations(self, time):
+        """`#declare`s of the palette textures and the (n_items,) palette
+        index of every item, or `([], None)` without `palette_indices`."""
+        if self.palette_indices is None:
+            return [], None
+        palette = np.asarray(self.palette(time), dtype=float)
+        prefix = self._texture_prefix()
+        declarations = [
+            f"#declare {prefix}{index} = {self._palette_texture(color, time)}"
+            for index, color in enumerate(palette.T)
+        ]
+        indices = np.asarray(self.palette_indices(time))
+        if np.any((indices < 0) | (indices >= palette.shape[-1])):
+            raise ValueError(
+                "palette_indices must be smaller than the number of "
+                f"palette colors ({palette.shape[-1]})"
+            )
+        return declarations, indices
+
+    def _texture_prefix(self):
+        """Identifier prefix of the declared palette textures, derived from
+        the class and object names (POV-Ray identifiers are at most 40
+        characters)."""
+        return "%s_%s_" % (type(self).__name__, re.sub(r"\W", "_", self.name)[:24])
+
+    def _palette_texture(self, color, time):
+        r, g, b, t = color
+        lines = [
+            "texture {",
+            "pigment { color rgbt <%0.1f,%0.1f,%0.1f,%0.1f>}" % (r, g, b, t),
+        ]
+        if self.bump_map.path != "":
+            lines.append(self.bump_map.generate_script())
+        lines.append(self.finish.generate_script(time))
+        lines.append("}")
+        return "\n".join(lines)
+
+    def _union_script(self, declarations, rows, time):
+        """The declarations followed by a union of the item `rows`, which
+        carries the object's texture for the items without their own."""
+        union = self._primitive_script("union", None, [rows] if rows else [], time)
+        return "\n".join(declarations + [union])
+
+
+class SphereCloud(_PaletteObject):
+    """Many spheres (e.g. the particles of a granular simulation) stored as
+    arrays and scripted as one POV-Ray union.
+
+    Unlike a `Sphere` per particle, the cloud holds a single texture state,
+    and each frame formats every sphere in one vectorized pass. Spheres
+    either share the cloud's texture or pick a `palette` color (see
+    `_PaletteObject`).
+
+    http://www.povray.org/documentation/view/3.7.0/283/
+
+    Parameters
+    ----------
+    name : str
+    positions : array_like or callable
+        (3, N) sphere centers.
+    radii : array_like or callable
+        (N,) sphere radii.
+    palette_indices : array_like or callable or None
+        (N,) index of each sphere's `palette` color. [default=None]
+    """
+
+    static_when_constant = True
+
+    def __init__(self, name, positions, radii, palette_indices=None):
+        position = TimeVecMN(positions)
+        super().__init__(name, np.shape(position(0))[-1], palette_indices)
+        self.position = position
+        self.radius = TimeVecN(radii, self.n_items)
+        self.color = TimeVecN([1, 0, 0])
+
+    def bounding_sphere(self, time):
+        return _bounding_sphere(self.position(time), self.radius(time))
+
+    def generate_script(self, time):
+        values = [self.position(time), np.reshape(self.radius(time), (1, -1))]
+        values = sf_array(np.vstack(values), self.precision)
+        declarations, indices = self._palette_declarations(time)
+        row = "sphere{<%r,%r,%r>,%r}"
+        if indices is not None:
+            values = np.vstack([values, indices.reshape(1, -1)])
+            row = "sphere{<%r,%r,%r>,%r texture{" + self._texture_prefix() + "%d}}"
+        rows = _format_rows(row, values, separator="\n    ")
+        self.str = self._union_script(declarations, rows, time)
+
+
+class RodBundle(_PaletteObject):
+    """Many slender rods (e.g. Cosserat rods) stored as arrays and scripted
+    as one POV-Ray union, every rod being formatted in one batched pass.
+
+    Rods either share the bundle's texture or pick a `palette` color (see
+    `_PaletteObject`).
+
+    Parameters
+    ----------
+    name : str
+    positions : array_like or callable
+        (3, n_nodes, n_rods) node positions, e.g. `Keyframes` over a
+        `DataSource` of simulation snapshots.
+    radii : array_like or callable
+        (n_nodes, n_rods) node radii.
+    palette_indices : array_like or callable or None
+        (n_rods,) index of each rod's `palette` color. [default=None]
+
+    Attributes
+    ----------
+    render_mode : str
+        "sphere_sweep" scripts each rod as a `sphere_sweep` (see
+        `interpolation_method`), "cylinders" as a chain of cylinders
+        (whose radius is the mean of their end nodes') joined by a sphere
+        at every node, which POV-Ray intersects much faster.
+        [default="sphere_sweep"]
+    interpolation_method : str
+        `sphere_sweep` spline, one of "linear_spline", "b_spline",
+        "cubic_spline". [default="linear_spline"]
+    """
+
+    RENDER_MODES = ("sphere_sweep", "cylinders")
+    static_when_constant = True
+
+    def __init__(self, name, positions, radii, palette_indices=None):
+        position = TimeArray(positions, (3, None, None))
+        n_nodes, n_rods = np.shape(position(0))[1:]
+        super().__init__(name, n_rods, palette_indices)
+        self.n_nodes = n_nodes
+        self.position = position
+        self.radius = TimeArray(radii, (n_nodes, n_rods))
+        self.color = TimeVecN([0.45, 0.39, 1])
+        self.render_mode = "sphere_sweep"
+        self.interpolation_method = "linear_spline"
+
+    @property
+    def render_mode(self):
+        return self._render_mode
+
+    @render_mode.setter
+    def render_mode(self, value):
+        if not isinstance(value, str):
+            raise TypeError("render_mode must be a string")
+        if value not in self.RENDER_MODES:
+            raise ValueError(
+                "render mode must be one of the following: "
+                + ", ".join(self.RENDER_MODES)
+            )
+        self._render_mode = value
+
+    @property
+    def interpolation_method(self):
+        return self._interpolation_method
+
+    @interpolation_method.setter
+    def interpolation_method(self, value):
+        if not isinstance(value, str):
+            raise TypeError("interpolation_method must be a string")
+        if value not in ("linear_spline", "b_spline", "cubic_spline"):
+            raise ValueError(
+                "interpolation method must be one of the following: "
+                "linear_spline, b_spline, cubic_spline"
+            )
+        self._interpolation_method = value
+
+    def bounding_sphere(self, time):
+        # cubic splines overshoot their control points
+        if (
+            self.render_mode == "sphere_sweep"
+            and self.interpolation_method == "cubic_spline"
+        ):
+            return None
+        return _bounding_sphere(self.position(time), self.radius(time))
+
+    def generate_script(self, time):
+        x = np.asarray(self.position(time), dtype=float)
+        r = np.asarray(self.radius(time), dtype=float)
+        n_nodes = x.shape[1]
+        if self.render_mode == "sphere_sweep":
+            # per rod: x, y, z, r of every node
+            values = np.concatenate([x, r[np.newaxis]]).transpose(1, 0, 2)
+            row = "sphere_sweep{%s %d" % (self.interpolation_method, n_nodes)
+            row += ",<%r,%r,%r>,%r" * n_nodes
+        else:
+            # per rod: the cylinders' ends and radii, then the node spheres
+            cylinders = np.concatenate(
+                [x[:, :-1], x[:, 1:], 0.5 * (r[np.newaxis, :-1] + r[np.newaxis, 1:])]
+            ).transpose(1, 0, 2)
+            spheres = np.concatenate([x, r[np.newaxis]]).transpose(1, 0, 2)
+            values = np.concatenate(
+                [cylinders.reshape(-1, x.shape[-1]), spheres.reshape(-1, x.shape[-1])]
+            )
+            row = "union{" + "cylinder{<%r,%r,%r>,<%r,%r,%r>,%r}" * (n_nodes - 1)
+            row += "sphere{<%r,%r,%r>,%r}" * n_nodes
+        values = sf_array(values.reshape(-1, x.shape[-1]), self.precision)
+
+        declarations, indices = self._palette_declarations(time)
+        if indices is not None:
+            values = np.vstack([values, indices.reshape(1, -1)])
+            row += " texture{" + self._texture_prefix() + "%d}"
+        rows = _format_rows(row + "}", values, separator="\n    ")
+        self.str = self._union_script(declarations, rows, time)
+
+
 class Cylinder(Scene.Object):
     """A capped cylinder between two end points.
 
     http://www.povray.org/documentation/view/3.7.0/284/
     """
 
+    static_when_constant = True
+
     def __init__(self, name, start_position, end_position, radius):
         super().__init__()
         self.name = name
@@ -91,6 +774,12 @@ class Cylinder(Scene.Object):
         self.radius = TimeScalar(radius)
         self.color = TimeVecN([1, 0, 0])
 
+    def bounding_sphere(self, time):
+        return _bounding_sphere(
+            np.transpose([self.start_position(time), self.end_position(time)]),
+            self.radius(time),
+        )
+
     def generate_script(self, time):
         x1 = self.start_position(time)
         x2 = self.end_position(time)
@@ -109,6 +798,8 @@ class Plane(Scene.Object):
     http://www.povray.org/documentation/view/3.7.0/297/
     """
 
+    static_when_constant = True
+
     def __init__(self, name, normal, distance):
         super().__init__()
         self.name = name
@@ -129,6 +820,8 @@ class Cone(Scene.Object):
     http://www.povray.org/documentation/view/3.7.0/285/
     """
 
+    static_when_constant = True
+
     def __init__(
         self, name, base_position, base_radius, cap_position, cap_radius, open=False
     ):
@@ -145,6 +838,12 @@ class Cone(Scene.Object):
     # a hollow tube/funnel look (POV-Ray's `open` keyword).
     open = _bool_property("open", default=False)
 
+    def bounding_sphere(self, time):
+        return _bounding_sphere(
+            np.transpose([self.base_position(time), self.cap_position(time)]),
+            [self.base_radius(time), self.cap_radius(time)],
+        )
+
     def generate_script(self, time):
         x1 = self.base_position(time)
         r1 = self.base_radius(time)
@@ -165,6 +864,12 @@ class Mesh(Scene.Object):
     http://www.povray.org/documentation/view/3.7.0/293/
     """
 
+    static_when_constant = True
+
+    # Defaults of meshes pickled by older versions (see `Scene.load`)
+    _block_includes = {}
+    lod_levels = ()
+
     def __init__(self, name, vertices, faces_indices):
         super().__init__()
         self.name = name
@@ -174,6 +879,10 @@ class Mesh(Scene.Object):
         self.uv_vectors = None
         self.face_color = self.FaceColor(n_faces=self.faces_indices(0).shape[-1])
         self.finish.specular = 0
+        # block name -> include file, see `write_includes`
+        self._block_includes = {}
+        # coarser versions of the mesh, see `build_lod_levels`
+        self.lod_levels = []
 
     class FaceColor:
         """Per-face coloring: a palette (`list`) plus a per-face palette
@@ -238,6 +947,83 @@ class Mesh(Scene.Object):
     def uv_vectors(self):
         self._uv_vectors = None
 
+    def bounding_sphere(self, time):
+        return _bounding_sphere(self.vertices(time))
+
+    class LevelOfDetail:
+        """A coarser version of a Mesh, made by clustering its vertices on a
+        grid (see `Mesh.build_lod_levels`).
+
+        The clustering is computed once; at every time the vertices of a
+        cluster are averaged, so deforming meshes keep their coarse levels.
+
+        Attributes
+        ----------
+        error : float
+            Bound of the distance between a vertex and its cluster's
+            average (the diagonal of a grid cell).
+        clusters : numpy.ndarray
+            Cluster of every vertex of the full mesh.
+        faces : numpy.ndarray
+            (3, n) faces between clusters (faces collapsed by the
+            clustering are dropped).
+        kept_faces : numpy.ndarray
+            Indices of the full mesh's faces kept in `faces`.
+        """
+
+        def __init__(self, vertices, faces_indices, cell_size):
+            self.error = float(cell_size * np.sqrt(3))
+            cells = np.floor(
+                (vertices - vertices.min(axis=1, keepdims=True)) / cell_size
+            ).astype(np.int64)
+            _, self.clusters = np.unique(cells, axis=1, return_inverse=True)
+            self.clusters = self.clusters.reshape(-1)
+            self.counts = np.bincount(self.clusters)
+            faces = self.clusters[faces_indices]
+            self.kept_faces = np.flatnonzero(
+                (faces[0] != faces[1]) & (faces[1] != faces[2]) & (faces[0] != faces[2])
+            )
+            self.faces = faces[:, self.kept_faces]
+
+        def vertices(self, vertices):
+            """Cluster averages of the full mesh's (3, N) `vertices`."""
+            return np.stack(
+                [
+                    np.bincount(self.clusters, weights=coordinate) / self.counts
+                    for coordinate in vertices
+                ]
+            )
+
+    def build_lod_levels(self, cell_sizes, time=0):
+        """Build coarser levels of detail by clustering the vertices on
+        grids of the given cell sizes (see `Mesh.LevelOfDetail`).
+
+        The clustering follows the mesh at `time`. Levels drop the vertex
+        normals; meshes with an image map have no levels.
+
+        Parameters
+        ----------
+        cell_sizes : list
+            Grid cell size of each level, in scene units.
+        time : float
+            Time of the mesh the clustering is computed on. [default=0]
+        """
+        if self.image_map.path != "":
+            raise ValueError("levels of detail do not support image maps")
+        vertices = np.asarray(self.vertices(time), dtype=float)
+        faces_indices = np.asarray(self.faces_indices(time))
+        levels = [
+            self.LevelOfDetail(vertices, faces_indices, cell_size)
+            for cell_size in sorted(cell_sizes)
+        ]
+        self.lod_levels = [level for level in levels if level.faces.shape[-1] > 0]
+
+    def lod_level(self, time, max_error):
+        for level in range(len(self.lod_levels), 0, -1):
+            if self.lod_levels[level - 1].error <= max_error:
+                return level
+        return 0
+
     def generate_script(self, time):
         """Build the POV-Ray mesh2 {...} script for this mesh at the given time.
 
@@ -248,13 +1034,12 @@ class Mesh(Scene.Object):
         blocks must stay in this relative order or POV-Ray's parser errors out
         expecting the next block in sequence).
         """
-        faces_indices = self.faces_indices(time)
-        n_faces = faces_indices.shape[-1]
         vertices = self.vertices(time)
+        if self._lod:
+            vertices = self.lod_levels[self._lod - 1].vertices(vertices)
         n_vertices = vertices.shape[-1]
 
         use_image_map = self.image_map.path != ""
-        use_face_colors = (not use_image_map) and self.face_color.indices is not None
 
         if use_image_map and self.uv_vectors is None:
             raise AttributeError("uv_vectors must be provided when image map is set")
@@ -264,71 +1049,113 @@ class Mesh(Scene.Object):
             self._pov_block(
                 "vertex_vectors",
                 n_vertices,
-                (
-                    self._fmt_floats(vertices[:, i], self.precision)
-                    for i in range(n_vertices)
-                ),
+                self._fmt_float_rows(vertices, self.precision),
             ),
         ]
 
-        if self.vertex_normals is not None:
+        if self.vertex_normals is not None and not self._lod:
             vertex_normals = self.vertex_normals(time)
             sections.append(
                 self._pov_block(
                     "normal_vectors",
                     n_vertices,
-                    (
-                        self._fmt_floats(vertex_normals[:, i], self.precision)
-                        for i in range(n_vertices)
-                    ),
+                    self._fmt_float_rows(vertex_normals, self.precision),
                 )
             )
 
+        sections.extend(
+            self._topology_block(name, time) for name in self._topology_blocks()
+        )
+
         if use_image_map:
-            uv_vectors = self.uv_vectors(time)
-            sections.append(
-                self._pov_block(
-                    "uv_vectors",
-                    n_vertices,
-                    (self._fmt_floats(uv_vectors[:, i]) for i in range(n_vertices)),
-                )
-            )
+            sections.append(self._generate_image_map_texture(time))
+
+        sections.append("\n}")
+        self.str = "\n".join(sections)
 
-        if not use_image_map:
-            sections.append(self._generate_texture_list(time, use_face_colors))
+    def _use_face_colors(self):
+        return self.image_map.path == "" and self.face_color.indices is not None
 
-        color_indices = None
+    def _topology_blocks(self):
+        """Names of the mesh2 blocks after the vertex/normal vectors, in
+        script order (excluding the image map texture)."""
+        if self.image_map.path != "":
+            return ["uv_vectors", "face_indices", "uv_indices"]
+        return ["texture_list", "face_indices"]
+
+    def _time_invariant_blocks(self):
+        """Names of the `_topology_blocks` whose script does not change over time."""
+        faces_constant = self.faces_indices.is_constant
+        use_face_colors = self._use_face_colors()
+        finish_constant = all(
+            value.is_constant for value in _time_callables(self.finish)
+        )
         if use_face_colors:
-            color_indices = self.face_color.indices(time)
-        elif not use_image_map:
-            color_indices = [0] * n_faces
+            palette_constant = self.face_color.list.is_constant
+        else:
+            palette_constant = self.color.is_constant and self.transmit.is_constant
 
-        sections.append(
-            self._pov_block(
-                "face_indices",
-                n_faces,
-                (
-                    self._fmt_ints(
-                        faces_indices[:, i],
-                        extra=None if color_indices is None else color_indices[i],
-                    )
-                    for i in range(n_faces)
-                ),
+        time_invariant = {
+            "uv_vectors": self.uv_vectors is not None and self.uv_vectors.is_constant,
+            "texture_list": palette_constant and finish_constant,
+            "face_indices": faces_constant
+            and (not use_face_colors or self.face_color.indices.is_constant),
+            "uv_indices": faces_constant,
+        }
+        return [name for name in self._topology_blocks() if time_invariant[name]]
+
+    def write_includes(self, path_prefix, time):
+        """Write the time-invariant face, UV and palette blocks once, to
+        `<path_prefix>_<block>.inc`, so that each frame only scripts the
+        vertex and normal vectors and `#include`s the rest.
+        """
+        self._block_includes = {}
+        for name in self._time_invariant_blocks():
+            include_path = f"{path_prefix}_{name}.inc"
+            with open(include_path, "w+") as f:
+                f.write(self._topology_block(name, time))
+            self._block_includes[name] = include_path
+
+    def clear_includes(self):
+        self._block_includes = {}
+
+    def _topology_block(self, name, time):
+        """Script of the `name` block of `_topology_blocks`, or an `#include`
+        of the file it was written to by `write_includes`."""
+        if name in self._block_includes and not self._lod:
+            return _pov_include(self._block_includes[name])
+
+        if name == "uv_vectors":
+            uv_vectors = self.uv_vectors(time)
+            return self._pov_block(
+                "uv_vectors", uv_vectors.shape[-1], self._fmt_float_rows(uv_vectors)
             )
-        )
 
-        if use_image_map:
-            sections.append(
-                self._pov_block(
-                    "uv_indices",
-                    n_faces,
-                    (self._fmt_ints(faces_indices[:, i]) for i in range(n_faces)),
-                )
+        if name == "texture_list":
+            return self._generate_texture_list(time, self._use_face_colors())
+
+        faces_indices = self.faces_indices(time)
+        if self._lod:
+            faces_indices = self.lod_levels[self._lod - 1].faces
+        n_faces = faces_indices.shape[-1]
+        if name == "uv_indices":
+            return self._pov_block(
+                "uv_indices", n_faces, self._fmt_int_rows(faces_indices)
             )
-            sections.append(self._generate_image_map_texture(time))
 
-        sections.append("\n}")
-        self.str = "\n".join(sections)
+        color_indices = None
+        if self._use_face_colors():
+            color_indices = self.face_color.indices(time)
+            if self._lod:
+                kept_faces = self.lod_levels[self._lod - 1].kept_faces
+                color_indices = np.asarray(color_indices)[kept_faces]
+        elif self.image_map.path == "":
+            color_indices = [0] * n_faces
+        return self._pov_block(
+            "face_indices",
+            n_faces,
+            self._fmt_int_rows(faces_indices, extra=color_indices),
+        )
 
     def _generate_texture_list(self, time, use_face_colors):
         """texture_list block for the non-image-map case (per-face colors or a single texture)."""
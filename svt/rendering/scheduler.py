@@ -0,0 +1,185 @@
+"""
+
+This module splits the available CPUs between concurrent POV-Ray processes
+and their worker threads.
+
+"""
+
+import math
+import os
+
+# POV-Ray's Work_Threads range.
+MAX_POV_THREADS = 512
+
+# Threads given to each POV-Ray process when the scheduler picks the split.
+# Parsing and bounding are single threaded, so beyond a few threads a frame
+# gains less than a second frame rendered alongside it.
+DEFAULT_THREADS_PER_PROCESS = 4
+
+
+def _cgroup_paths(proc_cgroup="/proc/self/cgroup"):
+    """Controllers -> cgroup path of this process, from `proc_cgroup`. The
+    cgroup v2 hierarchy is keyed by the empty string."""
+    paths = {}
+    try:
+        with open(proc_cgroup) as f:
+            for line in f:
+                _, controllers, path = line.rstrip("\n").split(":", 2)
+                for controller in controllers.split(","):
+                    paths[controller] = path
+    except (OSError, ValueError):
+        pass
+    return paths
+
+
+def _cgroup_ancestors(mount, path):
+    """Directories of the cgroup `path` under `mount` and of its parents,
+    from the cgroup itself up to the root."""
+    directories = []
+    parts = [part for part in path.split("/") if part]
+    while True:
+        directories.append(os.path.join(mount, *parts))
+        if not parts:
+            return directories
+        parts.pop()
+
+
+def _cgroup_cpu_quota(mount="/sys/fs/cgroup", proc_cgroup="/proc/self/cgroup"):
+    """CPU quota of this process' cgroup, in CPUs, or None if unlimited.
+
+    Reads the cgroup v2 `cpu.max` files, falling back to the cgroup v1
+    `cpu.cfs_quota_us`/`cpu.cfs_period_us` pairs, of the cgroup this process
+    belongs to (see `/proc/self/cgroup`, e.g. a systemd or Kubernetes
+    cgroup nested in the hierarchy) and of its parents, whose limits also
+    apply; the smallest quota is returned.
+    """
+    paths = _cgroup_paths(proc_cgroup)
+    quotas = []
+    found = False
+    for directory in _cgroup_ancestors(mount, paths.get("", "/")):
+        try:
+            with open(os.path.join(directory, "cpu.max")) as f:
+                quota, period = f.read().split()[:2]
+        except (OSError, ValueError):
+            continue
+        found = True
+        if quota != "max":
+            quotas.append(int(quota) / int(period))
+    if found:
+        return min(quotas, default=None)
+
+    cpu_mount = os.path.join(mount, "cpu")
+    for directory in _cgroup_ancestors(cpu_mount, paths.get("cpu", "/")):
+        try:
+            with open(os.path.join(directory, "cpu.cfs_quota_us")) as f:
+                quota = int(f.read())
+            with open(os.path.join(directory, "cpu.cfs_period_us")) as f:
+                period = int(f.read())
+        except (OSError, ValueError):
+            continue
+        if quota > 0 and period > 0:
+            quotas.append(quota / period)
+    return min(quotas, default=None)
+
+
+def available_cpus():
+    """Number of CPUs this process may run on.
+
+    Respects the CPU affinity mask (`os.sched_getaffinity`, where available)
+    and the cgroup CPU quota (e.g. a container or batch-job limit), which
+    `multiprocessing.cpu_count()` both ignore.
+
+    Returns
+    -------
+    int
+        At least 1.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS and Windows
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.floor(quota))
+    return max(1, cpus)
+
+
+def schedule_render(n_frames, processes=None, threads_per_process=None, cpus=None):
+    """Split CPUs between concurrent POV-Ray processes and `Work_Threads`.
+
+    Unless both are overridden, `processes * threads_per_process` never
+    exceeds `cpus`, so concurrent renders do not oversubscribe the machine.
+
+    Parameters
+    ----------
+    n_frames : int
+        Number of frames to render. No more processes than frames are used.
+    processes : int or None
+        Number of concurrent POV-Ray processes. [default=None]
+        If None, picked so each process gets `DEFAULT_THREADS_PER_PROCESS`
+        threads.
+    threads_per_process : int or None
+        `Work_Threads` of each POV-Ray process. [default=None]
+        If None, the CPUs are split evenly between the processes.
+    cpus : int or None
+        Number of CPUs to schedule on. [default=None]
+        If None, `available_cpus()` is used.
+
+    Returns
+    -------
+    tuple
+        `(processes, threads_per_process)`.
+    """
+    if cpus is None:
+        cpus = available_cpus()
+    for value, name in (
+        (processes, "processes"),
+        (threads_per_process, "threads_per_process"),
+        (cpus, "cpus"),
+    ):
+        if value is not None and (not isinstance(value, int) or value < 1):
+            raise ValueError(f"{name} must be a positive integer")
+    n_frames = max(1, n_frames)
+
+    if processes is None:
+        threads = threads_per_process or min(cpus, DEFAULT_THREADS_PER_PROCESS)
+        processes = min(n_frames, max(1, cpus // threads))
+    if threads_per_process is None:
+        threads_per_process = max(1, cpus // processes)
+    return processes, min(threads_per_process, MAX_POV_THREADS)
+
+
+def schedule_tiles(processes, threads_per_process, tiles, frames=None):
+    """Split the CPUs of a `schedule_render` split between frames rendered
+    concurrently and the tiles of each frame.
+
+    `frames * tile_processes * threads_per_tile` never exceeds
+    `processes * threads_per_process`, so tiled renders do not
+    oversubscribe the CPUs they were scheduled on.
+
+    Parameters
+    ----------
+    processes, threads_per_process : int
+        CPU budget, e.g. from `schedule_render`.
+    tiles : int
+        Number of tiles of every frame.
+    frames : int or None
+        Number of concurrent frames, e.g. the processes of a pool.
+        [default=None] If None, `processes // tiles` (at least one).
+
+    Returns
+    -------
+    tuple
+        `(frames, tile_processes, threads_per_tile)`: every frame renders
+        at most `tile_processes` of its tiles at once, with
+        `threads_per_tile` `Work_Threads` each.
+    """
+    if not isinstance(tiles, int) or tiles < 1:
+        raise ValueError("tiles must be a positive integer")
+    cpus = processes * threads_per_process
+    if frames is None:
+        frames = max(1, processes // tiles)
+    tile_processes = min(tiles, max(1, cpus // frames))
+    threads_per_tile = max(1, cpus // (frames * tile_processes))
+    return frames, tile_processes, min(threads_per_tile, MAX_POV_THREADS)
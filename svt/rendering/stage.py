@@ -1,5 +1,14 @@
 from collections import defaultdict
-from svt.rendering.utils import TimeVecN, sf, _bool_property, _wrapped_property
+import numpy as np
+from svt.rendering.utils import (
+    TimeVecN,
+    sf,
+    sf_array,
+    _format_rows,
+    _bool_property,
+    _wrapped_property,
+    _time_callables,
+)
 from functools import partial
 
 
@@ -89,12 +98,16 @@ class Stage:
 
         Methods
         -------
+        is_static : bool
+            Whether the object's script is time-invariant.
         _color2str : str
             Change triplet tuple (or list) of color into rgb string.
         _position2str : str
             Change triplet tuple (or list) of position vector into string.
         _fmt_floats, _fmt_ints, _pov_block : POV-Ray `mesh2` block builders
             (used by Mesh's generate_script).
+        _fmt_float_rows, _fmt_int_rows : vectorized `_fmt_floats`/`_fmt_ints`
+            over every column of an array at once.
         _fmt_vec, _primitive_script : POV-Ray primitive-block builders
             (used by Sphere, SphereSweep, Cylinder, Plane's generate_script).
         """
@@ -108,6 +121,26 @@ class Stage:
         def generate_script(self, time):
             raise NotImplementedError
 
+        # Whether `generate_script` depends on time only through the
+        # object's TimeCallable attributes (see `is_static`).
+        static_when_constant = False
+
+        def is_static(self):
+            """Return True if this object's script is the same at every time.
+
+            That is the case when the class defining `generate_script`
+            declares `static_when_constant = True` (as the built-in objects
+            do) and none of the object's TimeCallable attributes is backed
+            by a callable. Other objects, e.g. subclasses scripting time
+            themselves, are scripted every frame.
+            """
+            owner = next(
+                cls for cls in type(self).__mro__ if "generate_script" in vars(cls)
+            )
+            if not vars(owner).get("static_when_constant", False):
+                return False
+            return all(value.is_constant for value in _time_callables(self))
+
         def __str__(self):
             return self.str
 
@@ -143,9 +176,32 @@ class Stage:
                 row += ",%d" % extra
             return row
 
+        @staticmethod
+        def _fmt_float_rows(values, precision=None):
+            """Format every column of `values` as a `_fmt_floats` row, in one
+            vectorized pass. Rows are joined by newlines."""
+            values = sf_array(values, precision)
+            row = ",< %s>" % ",".join(["%f"] * values.shape[0])
+            return _format_rows(row, values)
+
+        @staticmethod
+        def _fmt_int_rows(values, extra=None):
+            """Format every column of `values` as a `_fmt_ints` row, in one
+            vectorized pass, with `extra[i]` as the trailing index of row i."""
+            values = np.asarray(values)
+            row = ",< %s>" % ",".join(["%d"] * values.shape[0])
+            if extra is not None:
+                values = np.vstack([values, np.asarray(extra).reshape(1, -1)])
+                row += ",%d"
+            return _format_rows(row, values)
+
         @staticmethod
         def _pov_block(name, count, rows):
-            """Assemble a 'name { count, row, row, ... }' POV-Ray block."""
+            """Assemble a 'name { count, row, row, ... }' POV-Ray block.
+            `rows` is either an iterable of rows or a string of
+            newline-joined rows (see `_fmt_float_rows`)."""
+            if isinstance(rows, str):
+                rows = [rows] if rows else []
             items = [f"\n{name} {{", f"\n{count}", *rows, "\n}"]
             return "\n".join(items)
 
@@ -233,6 +289,47 @@ class Stage:
             self.look_at = TimeVecN(look_at)
             self.sky = TimeVecN(sky)
 
+        def view_basis(self, time):
+            """Location and the unit view direction, right and up vectors of
+            the camera at `time`."""
+            location = np.asarray(self.location(time), dtype=float)
+            direction = np.asarray(self.look_at(time), dtype=float) - location
+            direction /= np.linalg.norm(direction)
+            right = np.cross(np.asarray(self.sky(time), dtype=float), direction)
+            right /= np.linalg.norm(right)
+            up = np.cross(direction, right)
+            return location, direction, right, up
+
+        def sees_sphere(self, time, center, radius, aspect_ratio, padding=0.1):
+            """Return False if the sphere (`center`, `radius`) lies entirely
+            outside the camera's view frustum at `time`.
+
+            The test is conservative: the frustum is widened by `padding`
+            (relative to the tangent of its half-angles), and spheres
+            crossing a frustum corner may be reported as seen.
+
+            Parameters
+            ----------
+            aspect_ratio : float
+                Image width over height; `angle` is the horizontal field of
+                view.
+            padding : float
+                Relative widening of the frustum. [default=0.1]
+            """
+            location, direction, right, up = self.view_basis(time)
+            offset = np.asarray(center, dtype=float) - location
+            depth = offset @ direction
+            if depth < -radius:
+                return False
+            tan_horizontal = np.tan(np.radians(self.angle) / 2) * (1 + padding)
+            tan_vertical = tan_horizontal / aspect_ratio
+            for axis, tangent in ((right, tan_horizontal), (up, tan_vertical)):
+                # distance beyond the side planes x = +-tangent * depth
+                lateral = abs(offset @ axis)
+                if (lateral - tangent * depth) / np.hypot(1, tangent) > radius:
+                    return False
+            return True
+
         def generate_script(self, time):
             location = self._position2str(self.location(time))
             look_at = self._position2str(self.look_at(time))
@@ -262,6 +359,8 @@ class Stage:
             Example) color='White', color=[1,1,1]
         """
 
+        static_when_constant = True
+
         def __init__(self, location, color, shadow=True):
             super().__init__()
             self.location = TimeVecN(location)
@@ -1,5 +1,6 @@
 from typing import Any
 import inspect
+from pathlib import Path
 import numpy as np
 from numbers import Real, Integral
 
@@ -14,6 +15,62 @@ def sf(x, precision=3):
     return x
 
 
+def sf_array(x, precision=3):
+    """Vectorized `sf`: round every element of `x` to `precision` significant
+    digits in one NumPy pass.
+
+    The result is equal, element by element, to `sf` (so formatting it gives
+    byte-identical scripts). Elements where the float shortcut could round
+    differently from `sf`'s exact decimal rounding (near-ties, exponent
+    estimates off by one, very large/small magnitudes) fall back to `sf`.
+    """
+    x = np.array(x, dtype=np.float64)
+    if precision is None:
+        return x
+
+    nonzero = np.isfinite(x) & (x != 0)
+    values = x[nonzero]
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        exponent = precision - 1 - np.floor(np.log10(np.abs(values)))
+        power = 10.0 ** np.abs(exponent)
+        # 10**k is exact for |k| <= 22, so scaling by it (and undoing the
+        # scaling of the rounded integer) is correctly rounded.
+        upscale = exponent >= 0
+        scaled = np.where(upscale, values * power, values / power)
+        rounded = np.rint(scaled)
+        result = np.where(upscale, rounded / power, rounded * power)
+
+        magnitude = np.abs(scaled)
+        unsafe = (
+            (precision > 8)
+            | (np.abs(exponent) > 22)
+            | (np.abs(magnitude - np.floor(magnitude) - 0.5) < 1e-7)
+            | (magnitude < 10.0 ** (precision - 1))
+            | (magnitude >= 10.0**precision)
+        )
+    result[unsafe] = [sf(value, precision) for value in values[unsafe]]
+    x[nonzero] = result
+    return x
+
+
+def _format_rows(row_format, values, separator="\n"):
+    """Format every column of the 2D array `values` with `row_format` (one
+    %-placeholder per row of `values`) and join the rows with `separator`,
+    in a single %-formatting pass."""
+    values = np.asarray(values)
+    if values.shape[-1] == 0:
+        return ""
+    return separator.join([row_format] * values.shape[-1]) % tuple(
+        values.T.ravel().tolist()
+    )
+
+
+def _pov_include(path):
+    """POV-Ray `#include` directive of `path`, made absolute (with forward
+    slashes) so it resolves regardless of POV-Ray's working directory."""
+    return '#include "{}"'.format(Path(path).resolve().as_posix())
+
+
 def _wrapped_property(attr, wrapper, default):
     """Property that stores its value as `wrapper(value)` under `_<attr>`,
     and resets to `wrapper(default)` on delete."""
@@ -78,6 +135,86 @@ def _extension_from_path(value, kind):
     return value[-3:]
 
 
+def _time_callables(obj, _seen=None):
+    """Yield every TimeCallable reachable through the attributes of `obj`.
+
+    Only svt objects are walked into (e.g. a Scene.Object's `finish`,
+    `image_map` or a Mesh's `face_color`), so user callables and arrays
+    stored on them are never traversed.
+    """
+    if _seen is None:
+        _seen = set()
+    for value in vars(obj).values():
+        if id(value) in _seen:
+            continue
+        _seen.add(id(value))
+        if isinstance(value, TimeCallable):
+            yield value
+        elif type(value).__module__.startswith("svt.") and hasattr(value, "__dict__"):
+            yield from _time_callables(value, _seen)
+
+
+def vectorized(func):
+    """Mark `func` as accepting an array of times.
+
+    A TimeCallable wrapping a vectorized callable evaluates a whole frame
+    schedule with a single call (see `TimeCallable.evaluate_many`). Given a
+    1D array of `n` times, the callable returns its usual value with an
+    extra trailing axis of length `n` (which is what NumPy expressions of
+    `t` naturally do); components that do not depend on time may be
+    returned as scalars and are broadcast. For instance::
+
+        position = vectorized(lambda t: [np.cos(t), np.sin(t), 0])
+    """
+    func.vectorized = True
+    return func
+
+
+def _stack_times(value, n_times):
+    """Array of a vectorized callable's return `value`, with its trailing
+    time axis broadcast to `n_times` (see `vectorized`)."""
+    if isinstance(value, (list, tuple)):
+        return np.stack([_stack_times(component, n_times) for component in value])
+    value = np.asarray(value)
+    if value.ndim == 0:
+        value = value[np.newaxis]
+    return np.broadcast_to(value, value.shape[:-1] + (n_times,))
+
+
+def _ndarray_condition(array, shape, kinds):
+    """`shape_condition` of an ndarray, with O(1) Python work: the shape
+    (`None` matching any length, e.g. `(3, None)` for 3×N) and dtype kind
+    (one of `kinds`, e.g. "fiu") are checked, and floats must be finite.
+    Returns None for object arrays, which need the element-wise check."""
+    if array.dtype.kind == "O":
+        return None
+    if (
+        array.ndim != len(shape)
+        or any(n is not None and n != length for n, length in zip(shape, array.shape))
+        or array.dtype.kind not in kinds
+    ):
+        return False
+    return array.dtype.kind != "f" or bool(np.isfinite(array).all())
+
+
+def _ndarray_condition_error(array, shape, kinds, description):
+    """`shape_condition_error` counterpart of `_ndarray_condition`."""
+    if array.ndim != len(shape) or any(
+        n is not None and n != length for n, length in zip(shape, array.shape)
+    ):
+        expected = "×".join("N" if n is None else str(n) for n in shape)
+        return (
+            f"Expected a {expected} array, but received an array of shape "
+            f"{array.shape}."
+        )
+    if array.dtype.kind not in kinds:
+        return (
+            f"Expected an array of {description}, but received an array of "
+            f"dtype '{array.dtype}'."
+        )
+    return "Expected all elements to be finite, but found NaN or infinity."
+
+
 class TimeCallable:
     """
     Wrap an array-like object or a callable as a function of time.
@@ -98,10 +235,22 @@ class TimeCallable:
 
         - an iterable that is returned unchanged for every time value, or
         - a callable ``f(time)`` returning an iterable.
+
+    Attributes
+    ----------
+    is_constant : bool
+        True if initialized with an iterable, i.e. the value does not
+        depend on time.
+    vectorized : bool
+        True if initialized with a callable marked with `vectorized`.
     """
 
+    # Default of instances pickled by older versions (see `__setstate__`)
+    _precomputed = None
+
     def __init__(self, input_array) -> None:
         self.array = input_array
+        self._precomputed = None
 
         if self._callable_condition(input_array):
             output = input_array(0)
@@ -113,6 +262,10 @@ class TimeCallable:
                 )
 
             self._callable_array = input_array
+            # Re-wrapping (e.g. through `_wrapped_property`) keeps constness.
+            self.is_constant = (
+                isinstance(input_array, TimeCallable) and input_array.is_constant
+            )
 
         else:
             try:
@@ -123,6 +276,7 @@ class TimeCallable:
                     )
 
                 self._callable_array = self._make_array_function(input_array)
+                self.is_constant = True
 
             except TypeError as exc:
                 raise TypeError(
@@ -130,10 +284,95 @@ class TimeCallable:
                     "accepting a single argument (time)."
                 ) from exc
 
+    def __setstate__(self, state) -> None:
+        """Restore a pickled instance, deriving `is_constant` for instances
+        pickled before it existed (e.g. scenes saved by `Scene.export`)."""
+        self.__dict__.update(state)
+        if "is_constant" not in state:
+            array = self.array
+            self.is_constant = not self._callable_condition(array) or (
+                isinstance(array, TimeCallable) and array.is_constant
+            )
+
     def __call__(self, time: float) -> Any:
         """Evaluate the array at the given time."""
+        if self._precomputed is not None:
+            indices, values, as_python = self._precomputed
+            index = indices.get(time)
+            if index is not None:
+                # Values come back as the callable returns them: arrays and
+                # numpy scalars as they are, lists and numbers as such.
+                return values[index].tolist() if as_python else values[index]
         return self._callable_array(time)
 
+    @property
+    def vectorized(self) -> bool:
+        return getattr(self._callable_array, "vectorized", False)
+
+    def evaluate_many(self, times) -> np.ndarray:
+        """Evaluate the array at every time of `times` at once.
+
+        Constant values are broadcast without being copied, and vectorized
+        callables (see `vectorized`) are called once with the whole array of
+        times. Other callables are called once per time.
+
+        Parameters
+        ----------
+        times : array_like
+            1D sequence of times.
+
+        Returns
+        -------
+        numpy.ndarray
+            Values stacked along the first axis, i.e. `result[i]` is the
+            value at `times[i]`. Constant values are read-only views.
+        """
+        times = np.asarray(times, dtype=float)
+        if times.ndim != 1:
+            raise ValueError("times must be a 1D sequence")
+        if self.is_constant:
+            value = np.asarray(self._callable_array(0))
+            return np.broadcast_to(value, times.shape + value.shape)
+        if isinstance(self._callable_array, TimeCallable):
+            return self._callable_array.evaluate_many(times)
+        if self.vectorized:
+            values = np.moveaxis(
+                _stack_times(self._callable_array(times), len(times)), -1, 0
+            )
+            if len(times) > 0 and not self.shape_condition(values[0]):
+                raise ValueError(
+                    "Vectorized callable returned an invalid object: "
+                    f"{self.shape_condition_error(values[0])}"
+                )
+            return values
+        if len(times) == 0:
+            return np.empty((0,) + np.shape(self._callable_array(0)))
+        return np.stack([np.asarray(self._callable_array(time)) for time in times])
+
+    def precompute(self, times) -> int:
+        """Evaluate the array at every time of `times` with `evaluate_many`,
+        and answer later calls at those times from the stored values.
+
+        Returns
+        -------
+        int
+            Size of the stored values in bytes.
+        """
+        values = self.evaluate_many(times)
+        times = np.asarray(times).tolist()
+        # the type the callable returns, e.g. a list or an ndarray
+        sample = self._callable_array(times[0]) if times else None
+        self._precomputed = (
+            {time: index for index, time in enumerate(times)},
+            values,
+            not isinstance(sample, (np.ndarray, np.generic)),
+        )
+        return values.nbytes
+
+    def clear_precomputed(self) -> None:
+        """Drop the values stored by `precompute`."""
+        self._precomputed = None
+
     @staticmethod
     def _make_array_function(array):
         """Create a constant function that always returns ``array``."""
@@ -199,7 +438,14 @@ class TimeVecN(TimeCallable):
         """
         Return True if ``array`` is an iterable containing exactly ``n``
         real-valued components.
+
+        NumPy arrays are checked by shape and dtype (and must be finite);
+        other inputs are checked element by element.
         """
+        if isinstance(array, np.ndarray):
+            condition = _ndarray_condition(array, (self.n,), "fiu")
+            if condition is not None:
+                return condition
         try:
             return len(array) == self.n and all(isinstance(x, Real) for x in array)
         except TypeError:
@@ -211,6 +457,8 @@ class TimeVecN(TimeCallable):
         Return a descriptive error explaining why ``array`` is not a valid
         N-dimensional vector.
         """
+        if isinstance(array, np.ndarray) and array.dtype.kind != "O":
+            return _ndarray_condition_error(array, (self.n,), "fiu", "real numbers")
         try:
             length = len(array)
         except TypeError:
@@ -253,7 +501,14 @@ class TimeVecMN(TimeCallable):
         """
         Return True if ``array`` is a M×N array-like object whose entries are
         all real numbers.
+
+        NumPy arrays are checked by shape and dtype (and must be finite);
+        other inputs are checked element by element.
         """
+        if isinstance(array, np.ndarray):
+            condition = _ndarray_condition(array, (self.m, None), "fiu")
+            if condition is not None:
+                return condition
         try:
             if len(array) != self.m:
                 return False
@@ -272,6 +527,10 @@ class TimeVecMN(TimeCallable):
         Return a descriptive error explaining why ``array`` is not a valid
         M×N array.
         """
+        if isinstance(array, np.ndarray) and array.dtype.kind != "O":
+            return _ndarray_condition_error(
+                array, (self.m, None), "fiu", "real numbers"
+            )
         try:
             n_rows = len(array)
         except TypeError:
@@ -280,8 +539,8 @@ class TimeVecMN(TimeCallable):
                 f"object of type '{type(array).__name__}'."
             )
 
-        if n_rows != 3:
-            return f"Expected an iterable with 3 rows, but received {n_rows}."
+        if n_rows != self.m:
+            return f"Expected an iterable with {self.m} rows, but received {n_rows}."
 
         try:
             row_lengths = [len(row) for row in array]
@@ -339,7 +598,14 @@ class TimeIndexN(TimeCallable):
         """
         Return True if ``array`` is an iterable containing exactly ``n``
         integer components.
+
+        NumPy arrays are checked by shape and dtype; other inputs are checked
+        element by element.
         """
+        if isinstance(array, np.ndarray):
+            condition = _ndarray_condition(array, (self.n,), "iu")
+            if condition is not None:
+                return condition
         try:
             return len(array) == self.n and all(isinstance(x, Integral) for x in array)
         except TypeError:
@@ -351,6 +617,8 @@ class TimeIndexN(TimeCallable):
         Return a descriptive error explaining why ``array`` is not a valid
         N-dimensional index vector.
         """
+        if isinstance(array, np.ndarray) and array.dtype.kind != "O":
+            return _ndarray_condition_error(array, (self.n,), "iu", "integer numbers")
         try:
             length = len(array)
         except TypeError:
@@ -393,7 +661,14 @@ class TimeIndexMN(TimeCallable):
         """
         Return True if ``array`` is a M×N array-like object whose entries are
         all integer numbers.
+
+        NumPy arrays are checked by shape and dtype; other inputs are checked
+        element by element.
         """
+        if isinstance(array, np.ndarray):
+            condition = _ndarray_condition(array, (self.m, None), "iu")
+            if condition is not None:
+                return condition
         try:
             if len(array) != self.m:
                 return False
@@ -412,6 +687,10 @@ class TimeIndexMN(TimeCallable):
         Return a descriptive error explaining why ``array`` is not a valid
         M×N array.
         """
+        if isinstance(array, np.ndarray) and array.dtype.kind != "O":
+            return _ndarray_condition_error(
+                array, (self.m, None), "iu", "integer numbers"
+            )
         try:
             n_rows = len(array)
         except TypeError:
@@ -421,7 +700,7 @@ class TimeIndexMN(TimeCallable):
             )
 
         if n_rows != self.m:
-            return f"Expected an iterable with m rows, but received {n_rows}."
+            return f"Expected an iterable with {self.m} rows, but received {n_rows}."
 
         try:
             row_lengths = [len(row) for row in array]
@@ -443,3 +722,40 @@ class TimeIndexMN(TimeCallable):
                     )
 
         return f"Object is not a valid {self.m}×N array."
+
+
+class TimeArray(TimeCallable):
+    """Time-dependent real-valued array of a given shape, e.g. `(3, None,
+    None)` for 3×N×K arrays (`None` matching any length)."""
+
+    def __init__(self, input_array, shape) -> None:
+        self.shape = tuple(shape)
+        super().__init__(input_array)
+
+    def shape_condition(self, array) -> bool:
+        """
+        Return True if ``array`` converts to a finite real-valued array of
+        the expected shape.
+        """
+        try:
+            array = np.asarray(array)
+        except ValueError:
+            # Ragged nested sequences
+            return False
+        return bool(_ndarray_condition(array, self.shape, "fiu"))
+
+    def shape_condition_error(self, array) -> str:
+        """
+        Return a descriptive error explaining why ``array`` is not a valid
+        array of the expected shape.
+        """
+        try:
+            converted = np.asarray(array)
+        except ValueError:
+            return "Expected an array, but received a ragged sequence."
+        if converted.dtype.kind == "O":
+            return (
+                f"Expected an array of real numbers, but received an object of "
+                f"type '{type(array).__name__}'."
+            )
+        return _ndarray_condition_error(converted, self.shape, "fiu", "real numbers")
@@ -0,0 +1,51 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from svt.rendering.data_sources import NpySource, NpzSource
+
+
+def _snapshots():
+    return np.arange(10 * 3 * 2, dtype=float).reshape(10, 3, 2)
+
+
+def test_npy_source_indexing(tmp_path):
+    snapshots = _snapshots()
+    np.save(tmp_path / "rod.npy", snapshots)
+    source = NpySource(tmp_path / "rod.npy")
+    assert source.shape == snapshots.shape
+    assert np.array_equal(source[3], snapshots[3])
+    assert np.array_equal(source[-1], snapshots[-1])
+    assert np.array_equal(
+        source[np.array([[1, 4], [9, 0]])], snapshots[[[1, 4], [9, 0]]]
+    )
+    assert np.array_equal(source[2:8:3], snapshots[2:8:3])
+    with pytest.raises(IndexError):
+        source[10]
+    with pytest.raises(TypeError):
+        source[1.5]
+
+
+def test_npz_source_indexes_across_chunks(tmp_path):
+    snapshots = _snapshots()
+    for chunk, start in enumerate((0, 4, 7)):
+        end = (4, 7, 10)[chunk]
+        np.savez(tmp_path / f"rod_{chunk}.npz", snapshots[start:end])
+    source = NpzSource(str(tmp_path / "rod_*.npz"), cached_chunks=1)
+    assert source.shape == snapshots.shape
+    assert np.array_equal(source[np.array([9, 0, 5, 4, 3])], snapshots[[9, 0, 5, 4, 3]])
+    assert np.array_equal(np.asarray(source), snapshots)
+    assert len(source._chunks) == 1
+
+
+def test_sources_pickle_without_their_open_files(tmp_path):
+    snapshots = _snapshots()
+    np.save(tmp_path / "rod.npy", snapshots)
+    np.savez(tmp_path / "rod.npz", snapshots)
+    for source in (NpySource(tmp_path / "rod.npy"), NpzSource(tmp_path / "rod.npz")):
+        source[0]  # open the memory map or cache a chunk
+        state = source.__getstate__()
+        assert all(state[handle] is None for handle in source._handles)
+        copy = pickle.loads(pickle.dumps(source))
+        assert np.array_equal(copy[[2, 7]], snapshots[[2, 7]])
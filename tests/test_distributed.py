@@ -0,0 +1,44 @@
+import shutil
+import sys
+import threading
+
+import pytest
+
+from svt.rendering import distributed, scheduler
+from svt.rendering.distributed import RenderCoordinator, run_worker
+
+
+@pytest.mark.skipif(shutil.which("false") is None, reason="needs `false`")
+def test_render_fails_when_every_local_worker_dies(tmp_path, monkeypatch):
+    frame = tmp_path / "frame"
+    frame.with_suffix(".pov").write_text("")
+    with RenderCoordinator() as coordinator:
+        # workers exit right away, as if svt could not be imported
+        monkeypatch.setattr(sys, "executable", shutil.which("false"))
+        coordinator.start_local_workers(2)
+        monkeypatch.undo()
+        with pytest.raises(RuntimeError, match="every local worker exited"):
+            coordinator.render([str(frame)], {"width": 4, "height": 4})
+
+
+def test_workers_split_their_own_cpus_when_no_threads_are_given(tmp_path, monkeypatch):
+    rendered_settings = []
+    monkeypatch.setattr(scheduler, "available_cpus", lambda: 8)
+    monkeypatch.setattr(
+        distributed,
+        "render_povray",
+        lambda file_path, **settings: rendered_settings.append(settings),
+    )
+    frame = tmp_path / "frame"
+    frame.with_suffix(".pov").write_text("")
+    with RenderCoordinator() as coordinator:
+        worker = threading.Thread(
+            target=run_worker,
+            args=(coordinator.address, coordinator.authkey),
+            kwargs={"processes": 2},
+        )
+        worker.start()
+        coordinator.render([str(frame)], {"width": 4, "height": 4})
+        coordinator.render([str(frame)], {"width": 4, "height": 4, "pov_thread": 1})
+    worker.join()
+    assert [settings["pov_thread"] for settings in rendered_settings] == [4, 1]
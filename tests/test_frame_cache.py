@@ -0,0 +1,19 @@
+import os
+
+from svt.rendering.renderer import FrameCache
+
+
+def test_cache_key_follows_includes_rewritten_within_mtime_resolution(tmp_path):
+    include = tmp_path / "static.inc"
+    script = tmp_path / "frame.pov"
+    include.write_text("sphere { <0, 0, 0>, 1 }\n")
+    script.write_text(f'#include "{include}"\n')
+    cache = FrameCache(tmp_path / "cache")
+    stat = include.stat()
+    key = cache.key(script, width=64, height=64)
+
+    # same size and, as on filesystems with coarse timestamps, same mtime
+    include.write_text("sphere { <0, 0, 0>, 2 }\n")
+    os.utime(include, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert cache.key(script, width=64, height=64) != key
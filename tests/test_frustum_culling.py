@@ -0,0 +1,35 @@
+import pytest
+
+from svt.rendering.stage import Stage
+
+ASPECT_RATIO = 16 / 9
+
+
+def _camera():
+    return Stage.Camera("main", location=[0, 0, -10], angle=60, look_at=[0, 0, 0])
+
+
+@pytest.mark.parametrize(
+    "center, radius",
+    [
+        ([0, 0, 0], 0.1),  # on the view axis
+        ([5, 0, 0], 0.1),  # inside the wider horizontal field of view
+        ([7, 0, 0], 1.0),  # center outside, crossing the right side plane
+        ([0, 0, -11], 2.0),  # around the camera
+    ],
+)
+def test_camera_sees_spheres_in_its_frustum(center, radius):
+    assert _camera().sees_sphere(0, center, radius, ASPECT_RATIO)
+
+
+@pytest.mark.parametrize(
+    "center, radius",
+    [
+        ([0, 0, -20], 1.0),  # behind the camera
+        ([100, 0, 0], 1.0),  # far off the right side
+        ([-100, 0, 0], 1.0),  # far off the left side
+        ([0, 5, 0], 1.0),  # above the narrower vertical field of view
+    ],
+)
+def test_camera_does_not_see_spheres_outside_its_frustum(center, radius):
+    assert not _camera().sees_sphere(0, center, radius, ASPECT_RATIO)
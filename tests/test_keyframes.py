@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from svt.rendering.keyframes import Keyframes
+
+
+def _quadratic_keyframes(interpolation):
+    times = np.arange(5.0)
+    return Keyframes(times, times**2, interpolation)
+
+
+@pytest.mark.parametrize(
+    "interpolation, expected",
+    [("step", [0.0, 1.0, 4.0, 16.0]), ("linear", [0.5, 2.5, 6.5, 16.0])],
+)
+def test_step_and_linear_keyframes(interpolation, expected):
+    keyframes = _quadratic_keyframes(interpolation)
+    times = [0.5, 1.5, 2.5, 7.0]
+    assert [keyframes(time) for time in times] == pytest.approx(expected)
+    assert keyframes(np.array(times)) == pytest.approx(expected)
+
+
+def test_cubic_keyframes_follow_a_quadratic_between_inner_keyframes():
+    keyframes = _quadratic_keyframes("cubic")
+    assert keyframes(1.5) == pytest.approx(2.25)
+    assert keyframes(2.25) == pytest.approx(2.25**2)
+    assert keyframes(3.0) == pytest.approx(9.0)
+
+
+def test_keyframes_of_vectors_stack_times_along_the_last_axis():
+    times = [0.0, 1.0]
+    keyframes = Keyframes(times, [[0.0, 0.0, 0.0], [2.0, 4.0, 6.0]])
+    assert keyframes(0.5) == pytest.approx([1.0, 2.0, 3.0])
+    assert keyframes(np.array(times)).shape == (3, 2)
+
+
+def test_keyframes_reuse_the_bracket_of_the_previous_call():
+    keyframes = _quadratic_keyframes("linear")
+    for index in range(4):
+        keyframes(index + 0.5)
+        assert keyframes._bracket == index
+    # jumping back is found by bisection
+    assert keyframes(0.25) == pytest.approx(0.25)
+    assert keyframes._bracket == 0
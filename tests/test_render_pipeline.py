@@ -0,0 +1,20 @@
+import pytest
+
+from svt import Scene
+
+
+def _fake_render(file_path):
+    return {}
+
+
+def test_pipelined_render_raises_callback_errors(tmp_path):
+    frames = [str(tmp_path / f"frame_{index}") for index in range(6)]
+    for file_path in frames:
+        open(file_path + ".pov", "w").close()
+
+    def on_rendered(file_path):
+        raise BrokenPipeError("ffmpeg exited")
+
+    # the error used to kill the pool's result thread and hang the render
+    with pytest.raises(BrokenPipeError, match="ffmpeg exited"):
+        Scene._render_pipelined(iter(frames), _fake_render, 2, 2, True, on_rendered)
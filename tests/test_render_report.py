@@ -0,0 +1,22 @@
+import os
+
+from svt import RenderReport, Scene, Sphere
+
+
+def test_static_includes_are_reported_as_setup(tmp_path):
+    scene = Scene()
+    scene.add_camera(name="main", location=[0, 0, -10], angle=50, look_at=[0, 0, 0])
+    scene.add_light(location=[0, 10, -10], color=[1, 1, 1])
+    scene.append(Sphere("static", position=[0, 0, 0], radius=1))
+    os.makedirs(tmp_path / "main")
+    report = RenderReport()
+    static_includes = scene._write_static_includes(str(tmp_path), "time", 0, report)
+    with scene._object_includes(str(tmp_path), "time", 0, report):
+        pass
+
+    size = os.path.getsize(static_includes[0])
+    assert report.setup["static_includes"]["script_bytes"] == size
+    assert "object_includes" in report.setup
+    summary = report.summary()
+    assert summary["setup_bytes"] == size
+    assert summary["script_bytes"] == size
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from svt.rendering.scene_objects import RodBundle
+
+
+def _bundle(n_nodes=3, n_rods=2, palette_indices=None):
+    positions = np.zeros((3, n_nodes, n_rods))
+    positions[0] = np.arange(n_nodes)[:, np.newaxis]
+    positions[1] = np.arange(n_rods)
+    return RodBundle(
+        "rods", positions, np.full((n_nodes, n_rods), 0.1), palette_indices
+    )
+
+
+def test_rod_bundle_scripts_a_sphere_sweep_per_rod():
+    bundle = _bundle()
+    bundle.generate_script(0)
+    script = str(bundle)
+    assert script.count("sphere_sweep{linear_spline 3,") == 2
+    assert "<0.0,1.0,0.0>,0.1,<1.0,1.0,0.0>,0.1,<2.0,1.0,0.0>,0.1}" in script
+
+
+def test_rod_bundle_scripts_cylinder_chains():
+    bundle = _bundle()
+    bundle.render_mode = "cylinders"
+    bundle.generate_script(0)
+    script = str(bundle)
+    assert script.count("cylinder{") == 2 * 2
+    assert script.count("sphere{") == 2 * 3
+    assert "cylinder{<0.0,0.0,0.0>,<1.0,0.0,0.0>,0.1}" in script
+
+
+@pytest.mark.parametrize("render_mode", RodBundle.RENDER_MODES)
+def test_rod_bundle_picks_palette_textures(render_mode):
+    bundle = _bundle(palette_indices=[1, 0])
+    bundle.palette = [[1, 0], [0, 1], [0, 0], [0, 0]]
+    bundle.render_mode = render_mode
+    bundle.generate_script(0)
+    script = str(bundle)
+    rows = [row for row in script.splitlines() if "texture{RodBundle_rods_" in row]
+    assert script.count("#declare RodBundle_rods_") == 2
+    assert len(rows) == 2
+    assert rows[0].endswith(" texture{RodBundle_rods_1}}")
+    assert rows[1].endswith(" texture{RodBundle_rods_0}}")
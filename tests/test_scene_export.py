@@ -0,0 +1,64 @@
+import numpy as np
+
+from svt import Mesh, Scene, Sphere, SphereSweep
+from svt.rendering.utils import _time_callables
+
+
+def _moving_sphere_scene():
+    scene = Scene()
+    scene.add_camera(name="main", location=[0, 0, -10], angle=50, look_at=[0, 0, 0])
+    scene.add_light(location=[0, 10, -10], color=[1, 1, 1])
+    scene.append(Sphere("ball", position=lambda t: [t, 0, 0], radius=1))
+    return scene
+
+
+def test_baked_scene_renders_the_frames_it_was_baked_at(tmp_path):
+    scene = _moving_sphere_scene()
+    frames_per_second = 10
+    baked_times = np.linspace(0, 1, 11)
+    scene.export(str(tmp_path / "baked"), times=baked_times)
+    loaded = Scene.load(str(tmp_path / "baked"))
+    # the frame times of render_video, which differ from np.linspace in
+    # their last bits (e.g. 3 / 10 against 0.30000000000000004)
+    for frame_number in range(frames_per_second):
+        time = frame_number / frames_per_second
+        assert loaded.generate_frame_script(0, time) == scene.generate_frame_script(
+            0, time
+        )
+
+
+def _strip_new_attributes(obj, names):
+    for name in names:
+        obj.__dict__.pop(name, None)
+
+
+def test_scene_pickled_by_older_versions_loads_and_scripts(tmp_path):
+    scene = _moving_sphere_scene()
+    scene.append(SphereSweep("sweep", np.random.rand(3, 6), np.full(6, 0.1)))
+    scene.append(Mesh("mesh", np.eye(3), np.array([[0], [1], [2]])))
+    expected = scene.generate_frame_script(0, 0.5)
+    # drop the attributes the objects of older versions did not pickle
+    for scene_object in scene.objects:
+        _strip_new_attributes(scene_object, ["_cullable", "_lod"])
+        for value in _time_callables(scene_object):
+            _strip_new_attributes(value, ["_precomputed", "is_constant"])
+    _strip_new_attributes(
+        scene.objects[1],
+        [
+            "_render_mode",
+            "_simplify_tolerance",
+            "_radial_resolution",
+            "_axial_resolution",
+            "removed_points",
+        ],
+    )
+    _strip_new_attributes(scene.objects[2], ["_block_includes", "lod_levels"])
+    scene.export(str(tmp_path / "old"))
+
+    loaded = Scene.load(str(tmp_path / "old.gz"))
+    assert loaded.generate_frame_script(0, 0.5) == expected
+    assert [scene_object.is_static() for scene_object in loaded.objects] == [
+        False,
+        True,
+        True,
+    ]
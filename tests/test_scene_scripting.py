@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from svt import RenderReport, Scene, Sphere
+
+
+def _multi_camera_scene(n_objects):
+    scene = Scene()
+    for name in ("left", "center", "right"):
+        scene.add_camera(name=name, location=[0, 0, -10], angle=50, look_at=[0, 0, 0])
+    scene.add_light(location=[0, 10, -10], color=[1, 1, 1])
+    for index in range(n_objects):
+        scene.append(
+            Sphere(
+                f"sphere_{index}",
+                position=lambda t, index=index: [index, np.sin(t), 0],
+                radius=1,
+            )
+        )
+    return scene
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1])
+def test_parallel_scripting_shares_object_scripts_between_views(tmp_path, chunk_size):
+    n_objects, times = 2, [0.0, 0.1, 0.2, 0.3, 0.4]
+    scene = _multi_camera_scene(n_objects)
+    jobs = scene._frame_jobs(str(tmp_path), times, "time")
+    report = RenderReport()
+    with scene._shared_scripts(), scene._instrumented(report):
+        scripted = list(
+            scene._iter_scripted_frames(
+                jobs, scripting_workers=2, chunk_size=chunk_size, report=report
+            )
+        )
+    assert scripted == [file_path for _, _, file_path in jobs]
+    # every object is scripted once per time step, not once per view
+    assert report.objects["Sphere"]["calls"] == n_objects * len(times)
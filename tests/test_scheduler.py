@@ -0,0 +1,37 @@
+from svt.rendering.scheduler import _cgroup_cpu_quota
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_cgroup_v2_quota_of_nested_cgroup(tmp_path):
+    mount = tmp_path / "cgroup"
+    proc_cgroup = tmp_path / "proc_cgroup"
+    _write(proc_cgroup, "0::/kubepods.slice/pod1/container\n")
+    _write(mount / "cpu.max", "max 100000\n")
+    _write(mount / "kubepods.slice" / "cpu.max", "800000 100000\n")
+    _write(mount / "kubepods.slice" / "pod1" / "container" / "cpu.max", "max 100000\n")
+    _write(mount / "kubepods.slice" / "pod1" / "cpu.max", "250000 100000\n")
+    assert _cgroup_cpu_quota(str(mount), str(proc_cgroup)) == 2.5
+
+
+def test_cgroup_v2_unlimited(tmp_path):
+    mount = tmp_path / "cgroup"
+    proc_cgroup = tmp_path / "proc_cgroup"
+    _write(proc_cgroup, "0::/user.slice\n")
+    _write(mount / "cpu.max", "max 100000\n")
+    _write(mount / "user.slice" / "cpu.max", "max 100000\n")
+    assert _cgroup_cpu_quota(str(mount), str(proc_cgroup)) is None
+
+
+def test_cgroup_v1_quota_of_nested_cgroup(tmp_path):
+    mount = tmp_path / "cgroup"
+    proc_cgroup = tmp_path / "proc_cgroup"
+    _write(proc_cgroup, "4:memory:/job\n2:cpu,cpuacct:/job\n")
+    _write(mount / "cpu" / "cpu.cfs_quota_us", "-1\n")
+    _write(mount / "cpu" / "cpu.cfs_period_us", "100000\n")
+    _write(mount / "cpu" / "job" / "cpu.cfs_quota_us", "300000\n")
+    _write(mount / "cpu" / "job" / "cpu.cfs_period_us", "100000\n")
+    assert _cgroup_cpu_quota(str(mount), str(proc_cgroup)) == 3.0
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from svt.rendering.scene_objects import SphereCloud
+
+
+def _cloud(palette_indices=None):
+    positions = [[0.0, 1.0, 2.0], [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+    return SphereCloud("my cloud", positions, [0.1, 0.2, 0.3], palette_indices)
+
+
+def test_sphere_cloud_scripts_one_sphere_per_item():
+    cloud = _cloud()
+    cloud.generate_script(0)
+    script = str(cloud)
+    assert script.startswith("union {")
+    assert script.count("sphere{") == 3
+    assert "sphere{<1.0,0.0,0.0>,0.2}" in script
+    assert "#declare" not in script
+
+
+def test_sphere_cloud_picks_palette_textures():
+    cloud = _cloud(palette_indices=[0, 1, 0])
+    cloud.palette = [[1, 0], [0, 1], [0, 0], [0, 0]]
+    cloud.generate_script(0)
+    script = str(cloud)
+    assert script.count("#declare SphereCloud_my_cloud_") == 2
+    assert "pigment { color rgbt <0.0,1.0,0.0,0.0>}" in script
+    assert "sphere{<0.0,0.0,0.0>,0.1 texture{SphereCloud_my_cloud_0}}" in script
+    assert "sphere{<1.0,0.0,0.0>,0.2 texture{SphereCloud_my_cloud_1}}" in script
+
+
+def test_sphere_cloud_rejects_indices_past_the_palette():
+    cloud = _cloud(palette_indices=np.array([0, 1, 2]))
+    cloud.palette = np.array([[1, 0], [0, 1], [0, 0], [0, 0]])
+    with pytest.raises(ValueError, match="palette_indices"):
+        cloud.generate_script(0)
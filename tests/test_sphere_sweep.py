@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from svt.rendering.scene_objects import SphereSweep
+
+
+def _straight_sweep(n_points, interpolation_method):
+    position = np.zeros((3, n_points))
+    position[0] = np.linspace(0.0, 1.0, n_points)
+    sweep = SphereSweep("sweep", position, np.full(n_points, 0.1))
+    sweep.interpolation_method = interpolation_method
+    return sweep
+
+
+@pytest.mark.parametrize(
+    "interpolation_method, minimum_points",
+    [("linear_spline", 2), ("b_spline", 4), ("cubic_spline", 4)],
+)
+def test_simplified_sweep_with_lod_keeps_minimum_points(
+    interpolation_method, minimum_points
+):
+    sweep = _straight_sweep(33, interpolation_method)
+    sweep.simplify_tolerance = 0.01
+    level = sweep.lod_level(0, max_error=10.0)
+    sweep._lod = max(level, 5)  # even a level thinning to the end points
+    sweep.generate_script(0)
+    assert f"{interpolation_method} {minimum_points}\n" in str(sweep)
+    assert str(sweep).count(",<") == minimum_points
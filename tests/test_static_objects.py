@@ -0,0 +1,36 @@
+import numpy as np
+
+from svt import Scene, Sphere
+
+
+class _PulsingSphere(Scene.Object):
+    """Custom object scripting its time dependence itself."""
+
+    def generate_script(self, time):
+        self.str = "sphere{<0,0,0>,%r}" % (1 + np.sin(time))
+
+
+class _ColoredSphere(Sphere):
+    """Subclass of a built-in keeping its `generate_script`."""
+
+
+def test_builtin_objects_with_constant_attributes_are_static():
+    assert Sphere("ball", position=[0, 0, 0], radius=1).is_static()
+    assert _ColoredSphere("ball", position=[0, 0, 0], radius=1).is_static()
+    assert not Sphere("ball", position=lambda t: [t, 0, 0], radius=1).is_static()
+
+
+def test_custom_objects_are_scripted_every_frame(tmp_path):
+    scene = Scene()
+    scene.add_camera(name="main", location=[0, 0, -10], angle=50, look_at=[0, 0, 0])
+    scene.add_light(location=[0, 10, -10], color=[1, 1, 1])
+    scene.append(_PulsingSphere())
+    assert not scene.objects[0].is_static()
+
+    (tmp_path / "main").mkdir()
+    static_includes = scene._write_static_includes(str(tmp_path), "time", 0)
+    scripts = [
+        scene.generate_frame_script(0, time, static_includes.get(0)) for time in (0, 1)
+    ]
+    assert "%r" % (1 + np.sin(1)) in scripts[1]
+    assert scripts[0] != scripts[1]
@@ -0,0 +1,46 @@
+import pytest
+
+from svt.rendering.renderer import _tile_regions
+from svt.rendering.scheduler import schedule_tiles
+
+
+@pytest.mark.parametrize("tiles", range(1, 17))
+def test_tile_regions_cover_frame_with_requested_tiles(tiles):
+    width, height = 97, 61
+    regions = _tile_regions(width, height, tiles)
+    assert len(regions) == tiles
+    assert (
+        sum(
+            (end_column - start_column + 1) * (end_row - start_row + 1)
+            for start_column, end_column, start_row, end_row in regions
+        )
+        == width * height
+    )
+
+
+def test_tile_regions_of_small_frame_are_capped():
+    assert len(_tile_regions(4, 4, 9)) <= 9
+    assert len(_tile_regions(4, 4, 9)) == 4
+
+
+@pytest.mark.parametrize("processes", [1, 2, 3, 4, 8])
+@pytest.mark.parametrize("threads_per_process", [1, 2, 4])
+@pytest.mark.parametrize("tiles", [1, 2, 3, 4, 9])
+def test_schedule_tiles_does_not_oversubscribe(processes, threads_per_process, tiles):
+    frames, tile_processes, threads = schedule_tiles(
+        processes, threads_per_process, tiles
+    )
+    assert frames >= 1 and 1 <= tile_processes <= tiles and threads >= 1
+    assert frames * tile_processes * threads <= processes * threads_per_process
+
+
+def test_schedule_tiles_keeps_untiled_split():
+    assert schedule_tiles(3, 4, 1) == (3, 1, 4)
+
+
+@pytest.mark.parametrize("tiles", [1, 2, 4, 6])
+def test_schedule_tiles_splits_engine_threads_between_tiles(tiles):
+    # a pool of 3 frames, each given 4 threads
+    frames, tile_processes, threads = schedule_tiles(3, 4, tiles, frames=3)
+    assert frames == 3
+    assert tile_processes * threads <= 4
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from svt.rendering.utils import TimeScalar, TimeVecMN, TimeVecN, vectorized
+
+
+@pytest.mark.parametrize(
+    "time_callable",
+    [
+        TimeVecN(lambda t: [t, 2 * t, 3 * t]),
+        TimeVecN(lambda t: np.array([t, 2 * t, 3 * t])),
+        TimeVecN(vectorized(lambda t: np.array([t, 2 * t, 3 * t]))),
+        TimeVecN([1, 2, 3]),
+        TimeScalar(lambda t: 2 * t),
+        TimeScalar(lambda t: np.float64(2 * t)),
+        TimeVecMN(lambda t: np.full((3, 4), t)),
+        TimeVecMN(lambda t: [[t] * 4] * 3),
+    ],
+)
+def test_precomputed_values_match_raw_values(time_callable):
+    times = [0.0, 0.5, 1.0]
+    raw = [time_callable(time) for time in times]
+    time_callable.precompute(times)
+    try:
+        precomputed = [time_callable(time) for time in times]
+    finally:
+        time_callable.clear_precomputed()
+    for raw_value, precomputed_value in zip(raw, precomputed):
+        assert type(precomputed_value) is type(raw_value)
+        assert np.shape(precomputed_value) == np.shape(raw_value)
+        assert np.asarray(precomputed_value).dtype == np.asarray(raw_value).dtype
+        np.testing.assert_array_equal(precomputed_value, raw_value)
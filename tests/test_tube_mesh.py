@@ -0,0 +1,54 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from svt.rendering.scene_objects import _tube_mesh
+
+
+def _straight_centerline(radius):
+    centerline = np.zeros((4, 5))
+    centerline[0] = np.linspace(0.0, 2.0, 5)
+    centerline[3] = radius
+    return centerline
+
+
+def _axis_offsets(points):
+    """Offsets of `points` from their closest point on the x axis segment
+    [0, 2], i.e. the outward directions of a straight capsule."""
+    closest = np.zeros_like(points)
+    closest[0] = np.clip(points[0], 0.0, 2.0)
+    return points - closest
+
+
+@pytest.mark.parametrize("radial_resolution", [3, 8, 16])
+def test_tube_mesh_vertices_lie_on_the_swept_spheres(radial_resolution):
+    vertices, normals, faces = _tube_mesh(_straight_centerline(0.2), radial_resolution)
+    offsets = _axis_offsets(vertices)
+    assert np.allclose(np.linalg.norm(offsets, axis=0), 0.2)
+    assert np.allclose(normals, offsets / 0.2)
+
+
+def test_tube_mesh_rings_follow_the_node_radii():
+    centerline = _straight_centerline(0.0)
+    centerline[3] = [0.1, 0.2, 0.3, 0.2, 0.1]
+    vertices, _, _ = _tube_mesh(centerline, 8)
+    for x, radius in zip(centerline[0, 1:-1], centerline[3, 1:-1]):
+        ring = vertices[:, np.isclose(vertices[0], x)]
+        assert ring.shape[1] == 8
+        assert np.allclose(np.linalg.norm(ring[1:], axis=0), radius)
+
+
+def test_tube_mesh_faces_close_the_tube_outward():
+    vertices, _, faces = _tube_mesh(_straight_centerline(0.2), 8)
+    assert faces.min() == 0
+    assert faces.max() == vertices.shape[1] - 1
+    assert len(np.unique(faces)) == vertices.shape[1]
+    # closed and consistently wound: every edge is run once in each direction
+    edges = Counter(
+        (triangle[i], triangle[(i + 1) % 3]) for triangle in faces.T for i in range(3)
+    )
+    assert all(edges[end, start] == 1 for start, end in edges)
+    a, b, c = (vertices[:, corner] for corner in faces)
+    face_normals = np.cross(b - a, c - a, axis=0)
+    assert np.all(np.sum(face_normals * _axis_offsets((a + b + c) / 3), axis=0) > 0)
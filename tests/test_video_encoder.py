@@ -0,0 +1,36 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from svt.rendering.encoder import VideoEncoder
+
+
+def _fake_ffmpeg(tmp_path, body):
+    executable = tmp_path / "ffmpeg"
+    executable.write_text(f"#!{sys.executable}\nimport sys\n{body}\n")
+    executable.chmod(executable.stat().st_mode | stat.S_IEXEC)
+    return str(executable)
+
+
+def test_encoder_reports_errors_larger_than_a_pipe(tmp_path, monkeypatch):
+    # ffmpeg writing more errors than a pipe holds used to block, and with it
+    # every frame written to it
+    ffmpeg = _fake_ffmpeg(
+        tmp_path,
+        "sys.stderr.write('x' * 1_000_000)\n"
+        "sys.stderr.flush()\n"
+        "sys.stdin.buffer.read()\n"
+        "sys.exit(1)",
+    )
+    monkeypatch.setenv("FFMPEG_BINARY", ffmpeg)
+    frame = tmp_path / "frame.png"
+    frame.write_bytes(os.urandom(1 << 20))
+
+    encoder = VideoEncoder(tmp_path / "movie", 24, profile="h264")
+    for frame_number in range(4):
+        encoder.add_frame(frame_number, frame)
+    with pytest.raises(IOError, match="x" * 1000) as error:
+        encoder.close()
+    assert len(str(error.value)) > 1_000_000